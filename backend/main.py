@@ -1,15 +1,54 @@
 """
 Junub Times - AI News Scraper for South Sudan
 """
-from fastapi import FastAPI, BackgroundTasks
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, Query, Request
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from pydantic import BaseModel, Field
 import asyncio
+import base64
+import bisect
+import calendar
+import contextvars
+import functools
+import gzip
+import re
+from collections import OrderedDict, deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 import feedparser
 import httpx
-from datetime import datetime
-from typing import List, Dict
+from datetime import datetime, timezone
+from typing import Callable, List, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+from email.utils import parsedate_to_datetime
+from xml.etree.ElementTree import ParseError, XMLPullParser
+import hashlib
+import heapq
+import html
+import itertools
+import json
+import math
+import multiprocessing
 import os
+import random
+import socket
+import string
+import sqlite3
+import sys
+import threading
+import zlib
+from array import array
+import time
+import uuid
+
+try:
+    import brotli  # optional: br content-coding
+except ImportError:
+    brotli = None
+try:
+    import orjson  # optional: faster JSON for large pages
+except ImportError:
+    orjson = None
 
 # ============== APP SETUP ==============
 app = FastAPI(title="Junub Times", version="1.0.0")
@@ -21,10 +60,920 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ============== METRICS ==============
+# Prometheus text-format metrics, scraped from /api/metrics. Kept in
+# process (no client library): counters, gauges and histograms keyed by
+# label values. Label sets stay small (source names, routes, statuses).
+metrics_registry: List["Metric"] = []
+
+def escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def format_labels(names: Tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{escape_label(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.values: Dict[tuple, object] = {}
+        metrics_registry.append(self)
+
+    def key(self, labels: Dict) -> tuple:
+        return tuple(labels[name] for name in self.labels)
+
+    def samples(self) -> List[str]:
+        return [f"{self.name}{format_labels(self.labels, key)} {value}"
+                for key, value in sorted(self.values.items())]
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        return "\n".join(lines + self.samples())
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self.key(labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        self.values[self.key(labels)] = value
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)):
+        super().__init__(name, help_text, labels)
+        self.buckets = buckets
+
+    def observe(self, value: float, **labels):
+        key = self.key(labels)
+        series = self.values.get(key)
+        if series is None:
+            # per-bucket counts (not cumulative), sum, count
+            series = self.values[key] = [[0] * len(self.buckets), 0.0, 0]
+        position = bisect.bisect_left(self.buckets, value)
+        if position < len(self.buckets):
+            series[0][position] += 1
+        series[1] += value
+        series[2] += 1
+
+    def samples(self) -> List[str]:
+        lines = []
+        for key, (counts, total, count) in sorted(self.values.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = 'le="%s"' % bound
+                lines.append(f"{self.name}_bucket{format_labels(self.labels, key, le)} {cumulative}")
+            le = 'le="+Inf"'
+            lines.append(f"{self.name}_bucket{format_labels(self.labels, key, le)} {count}")
+            lines.append(f"{self.name}_sum{format_labels(self.labels, key)} {round(total, 6)}")
+            lines.append(f"{self.name}_count{format_labels(self.labels, key)} {count}")
+        return lines
+
+FETCH_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30)
+fetch_seconds = Histogram("junub_fetch_duration_seconds",
+                          "Feed download time per source, request to full body", ("source",), FETCH_BUCKETS)
+fetch_bytes = Counter("junub_fetch_response_bytes_total", "Feed body bytes downloaded", ("source",))
+fetch_responses = Counter("junub_fetch_responses_total",
+                          "Feed responses by HTTP status (\"error\" when no response)", ("source", "status"))
+fetch_results = Counter("junub_fetch_results_total",
+                        "Feed cache outcome: miss, not_modified, unchanged, error", ("source", "result"))
+parse_seconds = Histogram("junub_parse_duration_seconds",
+                          "Feed parse + scoring time, measured in the parse worker", ("source",))
+entries_total = Counter("junub_entries_total",
+                        "Feed entries by outcome: kept (relevance >= 0.1), below_threshold, "
+                        "over_limit (past the per-feed cap, feedparser fallback only), invalid (no title or link)",
+                        ("source", "outcome"))
+dedupe_hits = Counter("junub_dedupe_hits_total",
+                      "Fetched entries not added: url, alias (known duplicate URL), near_duplicate, evicted",
+                      ("source", "kind"))
+feed_truncated = Counter("junub_feed_truncated_total",
+                         "Feed bodies not read to the end: entry_limit (enough entries), byte_cap",
+                         ("source", "reason"))
+parse_fallbacks = Counter("junub_parse_fallbacks_total",
+                          "Feeds the streaming parser rejected and feedparser parsed instead", ("source",))
+fetch_cycle_seconds = Histogram("junub_fetch_cycle_duration_seconds", "Wall time of a fetch cycle",
+                                buckets=(1, 2, 5, 10, 20, 30, 60, 120, 300))
+posts_published = Counter("junub_posts_published_total",
+                          "Publish attempts by outcome: posted, retry, failed", ("platform", "result"))
+store_size = Gauge("junub_store_records", "Records in memory by table and status", ("table", "status"))
+index_size = Gauge("junub_index_entries", "Entries in the in-memory indexes and buffers", ("index",))
+http_seconds = Histogram("junub_http_request_duration_seconds",
+                         "API latency per route template, until the response starts", ("route", "method"))
+http_requests = Counter("junub_http_requests_total", "API requests per route and status",
+                        ("route", "method", "status"))
+response_cache_results = Counter("junub_response_cache_total",
+                                 "ETag-cached responses by outcome: not_modified (304), hit (body reused), miss",
+                                 ("result",))
+
+class RouteTimer:
+    """ASGI middleware timing each request against its route template
+    (/api/articles/{article_id}), so ids don't explode the label set."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        started = time.perf_counter()
+
+        async def timed_send(message):
+            if message["type"] == "http.response.start":
+                route = scope.get("route")
+                labels = {"route": getattr(route, "path", "unmatched"), "method": scope["method"]}
+                http_seconds.observe(time.perf_counter() - started, **labels)
+                http_requests.inc(status=str(message["status"]), **labels)
+                if active_trace is not None:  # API load during a traced fetch cycle
+                    active_trace.add(f"{labels['method']} {labels['route']}", active_trace.lane("api"),
+                                     started, time.perf_counter(), {"status": message["status"]})
+            await send(message)
+
+        await self.app(scope, receive, timed_send)
+
+app.add_middleware(RouteTimer)
+
+# ============== TRACING ==============
+# Opt-in (TRACE_FETCH=1) span tracing of fetch cycles: cycle -> source ->
+# connect / download / parse / score / merge, plus API requests and event
+# loop stalls that overlap the cycle. The last TRACE_CYCLES cycles are kept
+# and /api/trace exports them as Chrome trace JSON (chrome://tracing,
+# ui.perfetto.dev). With tracing off span() returns a shared no-op.
+TRACE_FETCH = os.environ.get("TRACE_FETCH", "0") == "1"
+TRACE_CYCLES = int(os.environ.get("TRACE_CYCLES", "5"))
+TRACE_MAX_SPANS = int(os.environ.get("TRACE_MAX_SPANS", "20000"))  # per cycle
+TRACE_LAG_INTERVAL = 0.01  # event loop probe period
+TRACE_LAG_MIN = 0.005  # stalls shorter than this aren't recorded
+
+class Trace:
+    """Spans of one fetch cycle, on lanes (Chrome trace threads): the cycle
+    itself, one per source, api and event loop"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.args: Dict = {}
+        self.wall = time.time()
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+        self.lanes: Dict[str, int] = {"cycle": 0}
+        self.spans: List[tuple] = []  # (name, lane, start, end, args)
+        self.dropped = 0
+        self.pending: Dict[tuple, float] = {}  # open httpcore phases
+
+    def lane(self, name: str) -> int:
+        if name not in self.lanes:
+            self.lanes[name] = len(self.lanes)
+        return self.lanes[name]
+
+    def add(self, name: str, lane: int, start: float, end: float, args: Optional[Dict] = None):
+        if len(self.spans) >= TRACE_MAX_SPANS:
+            self.dropped += 1
+            return
+        self.spans.append((name, lane, start, end, args))
+
+    def chrome_events(self, pid: int) -> List[Dict]:
+        """Complete ("X") events in microseconds on the wall clock, plus
+        the process / thread names Perfetto shows"""
+        offset = self.wall - self.started
+        end = self.finished or time.perf_counter()
+        label = datetime.utcfromtimestamp(self.wall).strftime("%Y-%m-%d %H:%M:%S")
+        events = [{"ph": "M", "name": "process_name", "pid": pid, "tid": 0,
+                   "args": {"name": f"{self.name} {label}"}}]
+        for lane, tid in self.lanes.items():
+            events.append({"ph": "M", "name": "thread_name", "pid": pid, "tid": tid, "args": {"name": lane}})
+            events.append({"ph": "M", "name": "thread_sort_index", "pid": pid, "tid": tid,
+                           "args": {"sort_index": tid}})
+        args = dict(self.args, dropped_spans=self.dropped) if self.dropped else self.args
+        for name, lane, start, stop, span_args in [(self.name, 0, self.started, end, args)] + self.spans:
+            event = {"name": name, "ph": "X", "pid": pid, "tid": lane,
+                     "ts": round((start + offset) * 1e6, 1), "dur": round((stop - start) * 1e6, 1)}
+            if span_args:
+                event["args"] = span_args
+            events.append(event)
+        return events
+
+traces: deque = deque(maxlen=TRACE_CYCLES)
+active_trace: Optional[Trace] = None  # the cycle running now, for spans outside its tasks
+current_trace: contextvars.ContextVar[Optional[Trace]] = contextvars.ContextVar("current_trace", default=None)
+current_lane: contextvars.ContextVar[int] = contextvars.ContextVar("current_lane", default=0)
+
+class Span:
+    """Context manager timing one span; `lane` starts a new lane for it
+    and everything nested inside"""
+
+    __slots__ = ("trace", "name", "lane", "args", "tid", "token", "started")
+
+    def __init__(self, trace: Trace, name: str, lane: Optional[str], args: Dict):
+        self.trace = trace
+        self.name = name
+        self.lane = lane
+        self.args = args
+        self.token = None
+
+    def set(self, **args):
+        self.args.update(args)
+
+    def __enter__(self):
+        if self.lane is not None:
+            self.token = current_lane.set(self.trace.lane(self.lane))
+        self.tid = current_lane.get()
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.trace.add(self.name, self.tid, self.started, time.perf_counter(), self.args)
+        if self.token is not None:
+            current_lane.reset(self.token)
+
+class NoSpan:
+    """What span() returns when nothing is being traced"""
+
+    def set(self, **args):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        pass
+
+NO_SPAN = NoSpan()
+
+def span(name: str, lane: Optional[str] = None, **args):
+    trace = current_trace.get()
+    if trace is None:
+        return NO_SPAN
+    return Span(trace, name, lane, args)
+
+def annotate(**args):
+    """Attach args to the cycle span of the current trace"""
+    trace = current_trace.get()
+    if trace is not None:
+        trace.args.update(args)
+
+async def http_trace(event_name: str, info: Dict):
+    """httpcore trace hook: connect (DNS + TCP), TLS, request and response
+    phases as spans, e.g. connection.start_tls.started/.complete"""
+    trace = current_trace.get()
+    if trace is None:
+        return
+    phase, _, state = event_name.rpartition(".")
+    key = (current_lane.get(), phase)
+    if state == "started":
+        trace.pending[key] = time.perf_counter()
+    elif key in trace.pending:
+        trace.add(phase.split(".", 1)[-1], key[0], trace.pending.pop(key), time.perf_counter(),
+                  {"failed": True} if state == "failed" else None)
+
+def http_extensions() -> Optional[Dict]:
+    """Request extensions for httpx: the trace hook while tracing"""
+    return {"trace": http_trace} if current_trace.get() is not None else None
+
+async def probe_loop_lag(trace: Trace):
+    """Record event loop stalls (sleep overshoot) while the cycle runs"""
+    lane = trace.lane("event loop")
+    while True:
+        before = time.perf_counter()
+        await asyncio.sleep(TRACE_LAG_INTERVAL)
+        woke = time.perf_counter()
+        lag = woke - before - TRACE_LAG_INTERVAL
+        if lag >= TRACE_LAG_MIN:
+            trace.add("loop stall", lane, woke - lag, woke, {"ms": round(lag * 1000, 1)})
+
+def traced(name: str):
+    """Decorator: run the coroutine as one traced cycle when TRACE_FETCH is on"""
+    def decorate(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            global active_trace
+            if not TRACE_FETCH:
+                return await func(*args, **kwargs)
+            trace = Trace(name)
+            token = current_trace.set(trace)
+            active_trace = trace
+            probe = asyncio.create_task(probe_loop_lag(trace))
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                probe.cancel()
+                trace.finished = time.perf_counter()
+                traces.append(trace)
+                current_trace.reset(token)
+                if active_trace is trace:
+                    active_trace = None
+        return wrapper
+    return decorate
+
 # ============== IN-MEMORY STORAGE ==============
-# Simple storage (resets when app restarts - fine for MVP)
-articles_db: List[Dict] = []
-posts_db: List[Dict] = []
+class RecordStore:
+    """In-memory table of dict records with an id allocator and indexes.
+
+    Ids are handed out by a monotonic counter, never reused. `unique`
+    fields (article URLs) get a value -> id hash index for O(1) dedupe,
+    `indexed` fields keep a set of ids per value so lookups and counters
+    don't scan the table. `order_key` keeps a sorted (key, id) list for
+    paging. Change indexed fields through update() only.
+    """
+
+    def __init__(self, unique: Tuple[str, ...] = (), indexed: Tuple[str, ...] = (),
+                 order_key: Optional[Callable[[Dict], tuple]] = None):
+        self.records: Dict[int, Dict] = {}  # insertion ordered
+        self.order_key = order_key
+        self.order: List[tuple] = []
+        self.next_id = 1
+        self.unique: Dict[str, Dict] = {field: {} for field in unique}
+        self.indexes: Dict[str, Dict[object, set]] = {field: {} for field in indexed}
+        self.dirty: set = set()  # ids changed since the last persist()
+        self.removed: set = set()  # ids removed since the last persist()
+        self.allocate: Optional[Callable[[], int]] = None  # shared id source across workers
+        self.version = 0  # bumped on every change, keys response ETags
+        # called as listener(action, record, changes, previous) on
+        # add/update/remove, action is "added", "changed" or "removed"
+        self.listeners: List[Callable] = []
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.records.values())
+
+    def get(self, record_id: int) -> Optional[Dict]:
+        return self.records.get(record_id)
+
+    def find(self, field: str, value) -> Optional[Dict]:
+        """Look up a record by one of its unique fields"""
+        record_id = self.unique[field].get(value)
+        return None if record_id is None else self.records[record_id]
+
+    def ids_where(self, field: str, value) -> set:
+        return self.indexes[field].get(value, set())
+
+    def count(self, field: Optional[str] = None, value=None) -> int:
+        if field is None:
+            return len(self.records)
+        return len(self.ids_where(field, value))
+
+    def counts(self, field: str) -> Dict:
+        return {value: len(ids) for value, ids in self.indexes[field].items() if ids}
+
+    def add(self, record: Dict) -> Optional[Dict]:
+        """Insert a record and assign its id, None if a unique field clashes"""
+        for field, index in self.unique.items():
+            if record.get(field) in index:
+                return None
+        record_id = self.allocate() if self.allocate is not None else self.next_id
+        self.next_id = max(self.next_id, record_id + 1)
+        record["id"] = record_id
+        self.records[record_id] = record
+        self._index(record)
+        self.dirty.add(record_id)
+        self.version += 1
+        for listener in self.listeners:
+            listener("added", record, record, {})
+        return record
+
+    def update(self, record_id: int, **changes) -> Optional[Dict]:
+        record = self.records.get(record_id)
+        if record is None:
+            return None
+        previous = {field: record.get(field) for field in changes}
+        self._unindex(record)
+        for field, value in changes.items():
+            record[field] = value
+        self._index(record)
+        self.dirty.add(record_id)
+        self.version += 1
+        for listener in self.listeners:
+            listener("changed", record, changes, previous)
+        return record
+
+    def remove(self, record_id: int) -> Optional[Dict]:
+        record = self.records.get(record_id)
+        if record is None:
+            return None
+        self._unindex(record)
+        del self.records[record_id]
+        self.dirty.discard(record_id)
+        self.removed.add(record_id)
+        self.version += 1
+        for listener in self.listeners:
+            listener("removed", record, {}, {})
+        return record
+
+    def insert(self, record: Dict) -> Dict:
+        """Add a record that already has an id (written by another worker)"""
+        self.records[record["id"]] = record
+        self._index(record)
+        self.next_id = max(self.next_id, record["id"] + 1)
+        self.version += 1
+        for listener in self.listeners:
+            listener("added", record, record, {})
+        return record
+
+    def load(self, records: List[Dict]):
+        """Fill from persisted records, keeping their ids"""
+        order_key, self.order_key = self.order_key, None
+        for record in records:
+            self.records[record["id"]] = record
+            self._index(record)
+            self.next_id = max(self.next_id, record["id"] + 1)
+        self.order_key = order_key
+        self.version += 1
+        if order_key is not None:
+            self.order.extend((order_key(record), record["id"]) for record in records)
+            self.order.sort()
+
+    def page(self, after: Optional[tuple] = None, limit: int = 50,
+             match: Optional[Callable[[Dict], bool]] = None,
+             stop: Optional[Callable[[Dict], bool]] = None,
+             candidates: Optional[set] = None) -> Tuple[List[Dict], Optional[tuple]]:
+        """Walk records in order_key order, starting after the key `after`.
+
+        `match` filters records, `stop` ends the walk early (a cutoff on the
+        sort key). `candidates` are ids from a secondary index; when they are
+        a small slice of the table only those get sorted and walked.
+        Returns the records and the key to resume from, None once exhausted.
+        """
+        if candidates is not None and len(candidates) * 8 < len(self.order):
+            entries = sorted((self.order_key(self.records[i]), i) for i in candidates)
+        else:
+            entries = self.order
+        start = 0 if after is None else bisect.bisect_right(entries, (after, float("inf")))
+        
+        items = []
+        for position in range(start, len(entries)):
+            key, record_id = entries[position]
+            record = self.records[record_id]
+            if stop is not None and stop(record):
+                break
+            if match is None or match(record):
+                items.append(record)
+                if len(items) == limit:
+                    return items, key
+        return items, None
+
+    def take_dirty(self) -> List[Dict]:
+        records = [self.records[i] for i in sorted(self.dirty) if i in self.records]
+        self.dirty.clear()
+        return records
+
+    def take_removed(self) -> List[int]:
+        removed = sorted(self.removed)
+        self.removed.clear()
+        return removed
+
+    def _index(self, record: Dict):
+        for field, index in self.unique.items():
+            index[record.get(field)] = record["id"]
+        for field, index in self.indexes.items():
+            index.setdefault(record.get(field), set()).add(record["id"])
+        if self.order_key is not None:
+            bisect.insort(self.order, (self.order_key(record), record["id"]))
+
+    def _unindex(self, record: Dict):
+        for field, index in self.unique.items():
+            index.pop(record.get(field), None)
+        for field, index in self.indexes.items():
+            index.get(record.get(field), set()).discard(record["id"])
+        if self.order_key is not None:
+            entry = (self.order_key(record), record["id"])
+            position = bisect.bisect_left(self.order, entry)
+            if position < len(self.order) and self.order[position] == entry:
+                del self.order[position]
+
+def to_epoch(value) -> int:
+    """fetched_at as stored (int) from an int or a naive-UTC ISO string"""
+    if isinstance(value, str):
+        moment = datetime.fromisoformat(value)
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        return int(moment.timestamp())
+    return int(value or time.time())
+
+class Article:
+    """Compact article record.
+
+    Slots instead of a per-record dict, interned source/status strings,
+    fetched_at as epoch seconds, relevance as an int in hundredths and
+    duplicates as (source, url) pairs. It still reads and writes like the
+    old dict (article["title"]), so store and index code is shared with
+    posts; to_dict() is the JSON shape the API and SQLite use.
+    """
+    __slots__ = ("id", "title", "url", "summary", "source", "status",
+                 "fetched_at", "_relevance", "_duplicates")
+    FIELDS = ("id", "title", "url", "summary", "source", "relevance",
+              "status", "fetched_at", "duplicates")
+
+    def __init__(self, **fields):
+        self.id = 0
+        self.fetched_at = 0
+        self._relevance = 0
+        self._duplicates = ()
+        for field, value in fields.items():
+            self[field] = value
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Article":
+        return cls(**{field: data[field] for field in cls.FIELDS if field in data})
+
+    def __getitem__(self, field: str):
+        return getattr(self, field)
+
+    def __setitem__(self, field: str, value):
+        if field in ("source", "status"):
+            value = sys.intern(value)
+        elif field == "fetched_at":
+            value = to_epoch(value)
+        elif field not in self.FIELDS:
+            raise KeyError(field)
+        setattr(self, field, value)
+
+    def get(self, field: str, default=None):
+        return getattr(self, field, default)
+
+    @property
+    def relevance(self) -> float:
+        return self._relevance / 100
+
+    @relevance.setter
+    def relevance(self, value: float):
+        self._relevance = int(round(value * 100))
+
+    @property
+    def duplicates(self) -> Tuple[Tuple[str, str], ...]:
+        return self._duplicates
+
+    @duplicates.setter
+    def duplicates(self, value):
+        self._duplicates = tuple(
+            (sys.intern(d["source"]), d["url"]) if isinstance(d, dict) else (sys.intern(d[0]), d[1])
+            for d in value
+        )
+
+    def to_dict(self) -> Dict:
+        return {
+            "id": self.id,
+            "title": self.title,
+            "url": self.url,
+            "summary": self.summary,
+            "source": self.source,
+            "relevance": self.relevance,
+            "status": self.status,
+            "fetched_at": datetime.utcfromtimestamp(self.fetched_at).isoformat(),
+            "duplicates": [{"source": source, "url": url} for source, url in self._duplicates],
+        }
+
+def as_dict(record) -> Dict:
+    return record.to_dict() if isinstance(record, Article) else record
+
+# Reads are always served from these, the storage backend below only
+# makes them survive restarts
+# Articles page by relevance (highest first), posts newest first
+articles_db = RecordStore(unique=("url",), indexed=("status", "source"),
+                          order_key=lambda a: (-a["relevance"], -a["id"]))
+posts_db = RecordStore(indexed=("status", "platform", "article_id"),
+                       order_key=lambda p: (-p["id"],))
+
+# ============== PERSISTENCE ==============
+# "sqlite" keeps state in DB_PATH across restarts, "memory" keeps nothing
+STORAGE_BACKEND = os.environ.get("STORAGE_BACKEND", "sqlite")
+DB_PATH = os.environ.get("DB_PATH", "junub_times.db")
+
+class StorageBackend:
+    """Persistence for articles_db/posts_db. The base class stores nothing."""
+    persistent = False
+
+    def load(self, table: str) -> List[Dict]:
+        return []
+
+    def encode(self, table: str, record: Dict) -> tuple:
+        return ()
+
+    def write(self, batches: Dict[str, List[tuple]], deletions: Dict[str, List[int]],
+              evicted: List[Tuple[int, float]]):
+        pass
+
+    def load_evicted(self) -> List[Tuple[int, float]]:
+        return []
+
+    def close(self):
+        pass
+
+class SQLiteBackend(StorageBackend):
+    """SQLite in WAL mode, one row per record.
+
+    The full record lives in a JSON `data` column; the fields we filter or
+    sort on are mirrored into indexed columns.
+    """
+    persistent = True
+    COLUMNS = {
+        "articles": ("url", "status", "source", "relevance", "fetched_at"),
+        "posts": ("article_id", "status", "platform"),
+    }
+    INDEXES = {
+        "articles": ("url", "status", "relevance", "fetched_at"),
+        "posts": ("article_id", "status"),
+    }
+
+    def __init__(self, path: str):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.lock = threading.Lock()
+        self.worker: Optional[str] = None  # set by share(): writes go to the changelog
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            for table, columns in self.COLUMNS.items():
+                self.conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table} "
+                    f"(id INTEGER PRIMARY KEY, {', '.join(columns)}, data TEXT NOT NULL)"
+                )
+                for column in self.INDEXES[table]:
+                    self.conn.execute(
+                        f"CREATE INDEX IF NOT EXISTS {table}_{column} ON {table} ({column})"
+                    )
+            # rows written before Article kept epoch seconds hold ISO strings
+            self.conn.execute(
+                "UPDATE articles SET fetched_at = CAST(strftime('%s', fetched_at) AS INTEGER) "
+                "WHERE typeof(fetched_at) = 'text' AND strftime('%s', fetched_at) IS NOT NULL"
+            )
+            # URL hashes of articles dropped by retention, so they aren't re-fetched
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS evicted (url_hash INTEGER PRIMARY KEY, evicted_at REAL)"
+            )
+
+    def load(self, table: str) -> List[Dict]:
+        with self.lock:
+            rows = self.conn.execute(f"SELECT data FROM {table} ORDER BY id").fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def encode(self, table: str, record: Dict) -> tuple:
+        """Snapshot a record on the event loop before it is written"""
+        columns = tuple(to_epoch(record.get(column)) if column == "fetched_at" else record.get(column)
+                        for column in self.COLUMNS[table])
+        return (record["id"],) + columns + (json.dumps(as_dict(record)),)
+
+    def write(self, batches: Dict[str, List[tuple]], deletions: Dict[str, List[int]],
+              evicted: List[Tuple[int, float]]):
+        """Apply upserts, deletes and tombstones in a single transaction"""
+        with self.lock, self.conn:
+            for table, rows in batches.items():
+                columns = ("id",) + self.COLUMNS[table] + ("data",)
+                self.conn.executemany(
+                    f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) "
+                    f"VALUES ({', '.join('?' * len(columns))})",
+                    rows,
+                )
+            for table, ids in deletions.items():
+                self.conn.executemany(f"DELETE FROM {table} WHERE id = ?", [(i,) for i in ids])
+            if self.worker is not None:
+                log = [(table, row[0], 0, self.worker) for table, rows in batches.items() for row in rows]
+                log += [(table, i, 1, self.worker) for table, ids in deletions.items() for i in ids]
+                self.conn.executemany(
+                    "INSERT INTO changelog (tbl, record_id, deleted, worker) VALUES (?, ?, ?, ?)", log
+                )
+            if evicted:
+                self.conn.executemany("INSERT OR REPLACE INTO evicted VALUES (?, ?)", evicted)
+                self.conn.execute("DELETE FROM evicted WHERE evicted_at < ?",
+                                  (time.time() - RETENTION_TOMBSTONE_DAYS * 86400,))
+
+    def load_evicted(self) -> List[Tuple[int, float]]:
+        with self.lock:
+            return self.conn.execute("SELECT url_hash, evicted_at FROM evicted ORDER BY evicted_at").fetchall()
+
+    # ---- shared by several worker processes (see WORKERS) ----
+
+    def share(self, worker: str):
+        """Log every write for the other workers and create the lease, id
+        sequence and fetch job tables"""
+        self.worker = worker
+        with self.lock, self.conn:
+            self.conn.execute("CREATE TABLE IF NOT EXISTS leases "
+                              "(name TEXT PRIMARY KEY, holder TEXT, expires_at REAL)")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS sequences (name TEXT PRIMARY KEY, value INTEGER)")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS changelog (seq INTEGER PRIMARY KEY AUTOINCREMENT, "
+                              "tbl TEXT, record_id INTEGER, deleted INTEGER, worker TEXT)")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS fetch_requests "
+                              "(job_id TEXT PRIMARY KEY, sources TEXT, requested_at REAL)")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS jobs "
+                              "(id TEXT PRIMARY KEY, data TEXT, finished INTEGER, updated_at REAL)")
+
+    def acquire_lease(self, name: str, ttl: float) -> bool:
+        """Take or renew the named lease, True if this worker holds it"""
+        now = time.time()
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO leases (name, holder, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET holder = excluded.holder, expires_at = excluded.expires_at "
+                "WHERE leases.holder = excluded.holder OR leases.expires_at < ?",
+                (name, self.worker, now + ttl, now),
+            )
+            holder = self.conn.execute("SELECT holder FROM leases WHERE name = ?", (name,)).fetchone()
+        return holder is not None and holder[0] == self.worker
+
+    def release_lease(self, name: str):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM leases WHERE name = ? AND holder = ?", (name, self.worker))
+
+    def allocate_ids(self, table: str, count: int) -> range:
+        """Reserve `count` ids of a table, unique across workers. Never below
+        MAX(id) + 1: rows written without SHARED_STORE don't advance the
+        sequence, and INSERT OR REPLACE would overwrite them."""
+        with self.lock, self.conn:
+            self.conn.execute("INSERT OR IGNORE INTO sequences VALUES (?, 1)", (table,))
+            self.conn.execute(
+                f"UPDATE sequences SET value = MAX(value, (SELECT COALESCE(MAX(id), 0) + 1 FROM {table})) + ? "
+                "WHERE name = ?",
+                (count, table),
+            )
+            (end,) = self.conn.execute("SELECT value FROM sequences WHERE name = ?", (table,)).fetchone()
+        return range(end - count, end)
+
+    def change_cursor(self) -> int:
+        with self.lock:
+            return self.conn.execute("SELECT COALESCE(MAX(seq), 0) FROM changelog").fetchone()[0]
+
+    def changes_since(self, seq: int, limit: int = 2000) -> Tuple[List[Tuple[str, int, Optional[Dict]]], int, bool]:
+        """Records other workers wrote after changelog position `seq`:
+        (table, id, data or None if deleted), the new position, and whether
+        the log was pruned past `seq` (the caller must reload everything)"""
+        with self.lock:
+            (oldest,) = self.conn.execute("SELECT MIN(seq) FROM changelog").fetchone()
+            if oldest is not None and oldest > seq + 1 and seq > 0:
+                return [], seq, True
+            rows = self.conn.execute(
+                "SELECT seq, tbl, record_id, deleted, worker FROM changelog WHERE seq > ? ORDER BY seq LIMIT ?",
+                (seq, limit),
+            ).fetchall()
+            latest: Dict[Tuple[str, int], bool] = {}
+            for _, table, record_id, deleted, worker in rows:
+                if worker != self.worker:
+                    latest.pop((table, record_id), None)
+                    latest[(table, record_id)] = bool(deleted)
+            data: Dict[Tuple[str, int], Dict] = {}
+            for table in ("articles", "posts"):
+                ids = [i for (t, i), deleted in latest.items() if t == table and not deleted]
+                for start in range(0, len(ids), 500):
+                    chunk = ids[start:start + 500]
+                    for record_id, text in self.conn.execute(
+                        f"SELECT id, data FROM {table} WHERE id IN ({', '.join('?' * len(chunk))})", chunk
+                    ):
+                        data[(table, record_id)] = json.loads(text)
+        changes = [(table, record_id, data.get((table, record_id))) for table, record_id in latest]
+        return changes, rows[-1][0] if rows else seq, False
+
+    def prune_changelog(self, keep: int):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM changelog WHERE seq <= (SELECT MAX(seq) FROM changelog) - ?", (keep,))
+
+    def request_fetch(self, job_id: str, sources: List[str]):
+        with self.lock, self.conn:
+            self.conn.execute("INSERT INTO fetch_requests VALUES (?, ?, ?)",
+                              (job_id, json.dumps(sources), time.time()))
+
+    def take_fetch_requests(self) -> List[Tuple[str, List[str]]]:
+        with self.lock, self.conn:
+            rows = self.conn.execute("SELECT job_id, sources FROM fetch_requests ORDER BY requested_at").fetchall()
+            self.conn.execute("DELETE FROM fetch_requests")
+        return [(job_id, json.loads(sources)) for job_id, sources in rows]
+
+    def save_job(self, job_ids: List[str], data: Dict, finished: bool):
+        with self.lock, self.conn:
+            # a late in-progress snapshot must never overwrite a finished row
+            self.conn.executemany("INSERT INTO jobs VALUES (?, ?, ?, ?) ON CONFLICT(id) DO UPDATE SET "
+                                  "data = excluded.data, finished = excluded.finished, "
+                                  "updated_at = excluded.updated_at WHERE jobs.finished = 0",
+                                  [(job_id, json.dumps(data), int(finished), time.time()) for job_id in job_ids])
+            self.conn.execute("DELETE FROM jobs WHERE updated_at < ?", (time.time() - 86400,))
+
+    def load_job(self, job_id: str) -> Optional[Dict]:
+        with self.lock:
+            row = self.conn.execute("SELECT data FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            queued = self.conn.execute("SELECT 1 FROM fetch_requests WHERE job_id = ?", (job_id,)).fetchone()
+        if row is not None:
+            return json.loads(row[0])
+        return {"id": job_id, "status": "queued"} if queued else None
+
+    def jobs_finished_since(self, since: float) -> List[Tuple[str, Dict, float]]:
+        with self.lock:
+            rows = self.conn.execute("SELECT id, data, updated_at FROM jobs WHERE finished = 1 AND updated_at > ?",
+                                     (since,)).fetchall()
+        return [(job_id, json.loads(data), updated_at) for job_id, data, updated_at in rows]
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+storage: StorageBackend = StorageBackend()
+
+def open_storage() -> StorageBackend:
+    if STORAGE_BACKEND == "sqlite":
+        return SQLiteBackend(DB_PATH)
+    return StorageBackend()
+
+def load_state():
+    """Warm start: fill the in-memory stores from the backend"""
+    articles_db.load([Article.from_dict(data) for data in storage.load("articles")])
+    posts_db.load(storage.load("posts"))
+    evicted_urls.update(storage.load_evicted())
+
+# Held from taking a batch until it is written, so batches commit in the
+# order they were taken and an older snapshot never lands last
+persist_lock = asyncio.Lock()
+
+async def persist():
+    """Write every article/post changed since the last call, in one batch"""
+    async with persist_lock:
+        batches, deletions = {}, {}
+        for table, store in (("articles", articles_db), ("posts", posts_db)):
+            records = store.take_dirty()
+            removed = store.take_removed()
+            if records and storage.persistent:
+                batches[table] = [storage.encode(table, record) for record in records]
+            if removed:
+                deletions[table] = removed
+        evicted = list(evicted_pending)
+        evicted_pending.clear()
+        if storage.persistent and (batches or deletions or evicted):
+            await asyncio.to_thread(storage.write, batches, deletions, evicted)
+
+# ============== LIVE EVENTS ==============
+# Store changes are kept in a ring buffer and streamed to dashboards over
+# SSE, so a client only downloads what changed. Ids are per process; a
+# client that asks for an id that fell out of the buffer gets "reset".
+EVENT_BUFFER = int(os.environ.get("EVENT_BUFFER", "5000"))
+SSE_PING = 15.0
+
+class EventLog:
+    def __init__(self, size: int):
+        self.events: deque = deque(maxlen=size)  # (id, type, json data)
+        self.last_id = 0
+        self.wakeup = asyncio.Event()
+
+    def publish(self, event_type: str, data: Dict):
+        self.last_id += 1
+        self.events.append((self.last_id, event_type, json.dumps(data)))
+        wakeup, self.wakeup = self.wakeup, asyncio.Event()
+        wakeup.set()
+
+    def since(self, event_id: int) -> Tuple[List[tuple], bool]:
+        """Events after event_id, and whether the client missed some"""
+        if event_id > self.last_id:  # from a log that no longer exists
+            return [], True
+        if event_id == self.last_id:
+            return [], False
+        missed = bool(self.events) and self.events[0][0] > event_id + 1
+        newer = []
+        for event in reversed(self.events):
+            if event[0] <= event_id:
+                break
+            newer.append(event)
+        newer.reverse()
+        return newer, missed
+
+    async def wait(self, timeout: float) -> bool:
+        try:
+            await asyncio.wait_for(self.wakeup.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+event_log = EventLog(EVENT_BUFFER)
+
+def store_events(kind: str):
+    """Store listener publishing <kind>-added/<kind>-changed events"""
+    def listener(action: str, record: Dict, changes: Dict, previous: Dict):
+        if action == "added":
+            event_log.publish(f"{kind}-added", as_dict(record))
+        elif action == "removed":
+            event_log.publish(f"{kind}-removed", {"id": record["id"], "status": record["status"]})
+        else:
+            rendered = as_dict(record)
+            event_log.publish(f"{kind}-changed", {
+                "id": record["id"],
+                "changes": {field: rendered[field] for field in changes},
+                "previous": {"status": previous["status"]} if "status" in previous else {},
+            })
+    return listener
+
+articles_db.listeners.append(store_events("article"))
+posts_db.listeners.append(store_events("post"))
 
 # ============== NEWS SOURCES ==============
 RSS_SOURCES = [
@@ -97,6 +1046,24 @@ RSS_SOURCES = [
     ("Google News - AFCON", "https://news.google.com/rss/search?q=AFCON+%22Africa+Cup%22&hl=en&gl=US&ceid=US:en"),
 ]
 
+# ============== FETCH SETTINGS ==============
+# "concurrent" fetches all sources at once over one pooled client,
+# "sequential" walks RSS_SOURCES one by one (useful for debugging a feed)
+FETCH_MODE = os.environ.get("FETCH_MODE", "concurrent")
+FETCH_TIMEOUT = float(os.environ.get("FETCH_TIMEOUT", "30"))
+FETCH_CONCURRENCY = int(os.environ.get("FETCH_CONCURRENCY", "12"))
+FETCH_PER_HOST = int(os.environ.get("FETCH_PER_HOST", "4"))
+FETCH_CYCLE_DEADLINE = float(os.environ.get("FETCH_CYCLE_DEADLINE", "120"))
+# Feed bodies are read as a stream: reading stops after FEED_ENTRY_LIMIT
+# entries or FEED_MAX_BYTES (decoded) per source, whichever comes first.
+FEED_ENTRY_LIMIT = int(os.environ.get("FEED_ENTRY_LIMIT", "15"))
+FEED_MAX_BYTES = int(os.environ.get("FEED_MAX_BYTES", str(2 * 1024 * 1024)))
+# Past the entry limit a tail up to this size (as sent) is still read, so the
+# keep-alive connection goes back to the pool instead of being closed.
+FEED_DRAIN_BYTES = int(os.environ.get("FEED_DRAIN_BYTES", str(64 * 1024)))
+SUMMARY_CHARS = 500
+USER_AGENT = "JunubTimes/1.0 (+https://github.com/wolthiik-bit/junub-times)"
+
 # ============== RELEVANCE KEYWORDS ==============
 KEYWORDS = [
     # South Sudan - Highest Priority
@@ -135,101 +1102,1862 @@ KEYWORDS = [
     "cholera", "malaria", "health crisis",
 ]
 
+# Optional per-keyword weights, anything not listed counts as 1.0
+KEYWORD_WEIGHTS: Dict[str, float] = {}
+
+# ============== RELEVANCE MATCHER ==============
+TOKEN_RE = re.compile(r"[^\W_]+")
+
+def normalize_token(token: str) -> str:
+    """Fold simple plurals so "refugee" still matches "refugees" """
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+def tokenize(text: str) -> List[str]:
+    return [normalize_token(t) for t in TOKEN_RE.findall(text.lower())]
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over word tokens.
+
+    Keywords only match whole words ("bor" no longer fires on "border"),
+    and an article is scored in one pass over its tokens regardless of how
+    many keywords are loaded. Overlapping keywords all count, so
+    "south sudan" also matches "sudan", same as the old substring scan.
+    `vocab` maps every raw token that folds onto a keyword token, so the
+    scan neither folds nor walks failure links for the (most) words that
+    are in no keyword.
+    """
+
+    def __init__(self, keywords: List[str], weights: Optional[Dict[str, float]] = None):
+        weights = weights or {}
+        self.keywords: List[str] = []
+        self.weights: List[float] = []
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[Tuple[int, ...]] = [()]
+        
+        for kw in dict.fromkeys(keywords):
+            tokens = tokenize(kw)
+            if not tokens:
+                continue
+            node = 0
+            for token in tokens:
+                child = self.goto[node].get(token)
+                if child is None:
+                    child = len(self.goto)
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(())
+                    self.goto[node][token] = child
+                node = child
+            self.output[node] += (len(self.keywords),)
+            self.keywords.append(kw)
+            self.weights.append(weights.get(kw, 1.0))
+        
+        self.vocab: Dict[str, str] = {}
+        for node in self.goto:
+            for token in node:
+                if normalize_token(token) == token:
+                    self.vocab[token] = token
+                if not token.endswith("s") and len(token) >= 3:
+                    self.vocab[token + "s"] = token  # the plural normalize_token folds
+        
+        # Breadth-first so every failure target is finished before its users
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for token, child in self.goto[node].items():
+                queue.append(child)
+                target = self.fail[node]
+                while target and token not in self.goto[target]:
+                    target = self.fail[target]
+                self.fail[child] = self.goto[target].get(token, 0)
+                self.output[child] += self.output[self.fail[child]]
+
+    def matches(self, text: str) -> set:
+        """Indexes of every keyword found in text"""
+        goto, fail, output, vocab = self.goto, self.fail, self.output, self.vocab
+        found = set()
+        node = 0
+        for raw in TOKEN_RE.findall(text.lower()):
+            token = vocab.get(raw)
+            if token is None:  # no keyword has it: every state falls back to the root
+                node = 0
+                continue
+            while node and token not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(token, 0)
+            if output[node]:
+                found.update(output[node])
+        return found
+
+    def score(self, text: str) -> float:
+        weights = self.weights
+        return sum(weights[i] for i in self.matches(text))
+
+    def score_batch(self, texts: List[str]) -> List[float]:
+        """score() per text; no shared work, just one call per feed"""
+        return [self.score(text) for text in texts]
+
+# Built once at import, rebuild with KeywordMatcher(...) if KEYWORDS change
+keyword_matcher = KeywordMatcher(KEYWORDS, KEYWORD_WEIGHTS)
+
 # ============== HELPER FUNCTIONS ==============
 def calculate_relevance(title: str, summary: str) -> float:
-    text = f"{title} {summary}".lower()
-    score = sum(1 for kw in KEYWORDS if kw in text)
+    score = keyword_matcher.score(f"{title} {summary}")
     return min(score / 5, 1.0)
 
-async def fetch_rss(url: str, source_name: str) -> List[Dict]:
-    articles = []
+def calculate_relevance_batch(items: List[Tuple[str, str]]) -> List[float]:
+    """calculate_relevance() over a feed's (title, summary) pairs"""
+    scores = keyword_matcher.score_batch([f"{title} {summary}" for title, summary in items])
+    return [min(score / 5, 1.0) for score in scores]
+
+TAG_RE = re.compile(r"<[^>]+>")
+
+def strip_html(text: str) -> str:
+    return " ".join(html.unescape(TAG_RE.sub(" ", text)).split())
+
+# ============== HTTP CLIENT ==============
+# One long-lived client so connections (and TLS sessions) to news.google.com
+# and friends are reused across sources and cycles.
+http_client: Optional[httpx.AsyncClient] = None
+host_limits: Dict[str, asyncio.Semaphore] = {}
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared pooled HTTP client, creating it on first use"""
+    global http_client
+    if http_client is None or http_client.is_closed:
+        http_client = httpx.AsyncClient(
+            timeout=FETCH_TIMEOUT,
+            follow_redirects=True,
+            headers={"User-Agent": USER_AGENT},
+            limits=httpx.Limits(
+                max_connections=FETCH_CONCURRENCY,
+                max_keepalive_connections=FETCH_CONCURRENCY,
+                keepalive_expiry=300,
+            ),
+        )
+    return http_client
+
+def host_limit(url: str) -> asyncio.Semaphore:
+    """Per-host semaphore so one busy host can't take every connection"""
+    host = urlsplit(url).hostname or ""
+    if host not in host_limits:
+        host_limits[host] = asyncio.Semaphore(FETCH_PER_HOST)
+    return host_limits[host]
+
+# ============== FEED PARSER ==============
+# Streaming path for RSS 2.0, RDF and Atom: chunks go through an expat pull
+# parser as they arrive and reading stops once FEED_ENTRY_LIMIT entries are
+# in. Feeds expat rejects (HTML entities, broken markup) fall back to
+# feedparser on the buffered body.
+ENTRY_TAGS = {"item", "entry"}
+SUMMARY_TAGS = ("description", "summary", "encoded", "content")  # encoded is content:encoded
+DATE_TAGS = ("pubDate", "published", "updated", "date", "issued", "modified")
+
+def local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+def clean_summary(text: str) -> str:
+    """Plain-text summary, at most SUMMARY_CHARS.
+
+    Only a bounded prefix of the raw HTML is stripped, so feeds that put
+    whole articles in the description cost no more than short ones.
+    """
+    raw = text[:SUMMARY_CHARS * 8]
+    if len(raw) < len(text):
+        cut = raw.rfind("<")
+        if cut > raw.rfind(">"):  # don't leave half a tag behind
+            raw = raw[:cut]
+    return strip_html(raw)[:SUMMARY_CHARS]
+
+def parse_feed_date(text: str) -> Optional[float]:
+    """RFC 822 (RSS) or ISO 8601 (Atom, dc:date) -> epoch seconds"""
+    text = text.strip()
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(url)
-            feed = feedparser.parse(response.text)
-            
-            for entry in feed.entries[:15]:
-                title = entry.get("title", "").strip()
-                link = entry.get("link", "").strip()
-                summary = entry.get("summary", "")[:500]
-                
-                if title and link:
-                    relevance = calculate_relevance(title, summary)
-                    if relevance >= 0.1:  # Only keep somewhat relevant articles
-                        articles.append({
-                            "id": len(articles_db) + len(articles) + 1,
-                            "title": title,
-                            "url": link,
-                            "summary": summary,
-                            "source": source_name,
-                            "relevance": round(relevance, 2),
-                            "status": "fetched",
-                            "fetched_at": datetime.utcnow().isoformat()
-                        })
-    except Exception as e:
-        print(f"Error fetching {source_name}: {e}")
-    
+        moment = parsedate_to_datetime(text)
+    except (TypeError, ValueError):
+        try:
+            moment = datetime.fromisoformat(text.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+class FeedStream:
+    """Incremental feed parser: feed() body chunks until it returns True.
+
+    Keeps (title, link, summary) for the first `limit` entries, summaries
+    already stripped and cut, and each entry's publish time. Parse errors
+    land in `error` rather than raising; the caller then falls back to
+    feedparser.
+    """
+
+    def __init__(self, limit: int = FEED_ENTRY_LIMIT):
+        self.limit = limit
+        self.parser = XMLPullParser(events=("end",))
+        self.entries: List[Tuple[str, str, str]] = []
+        self.entry_times: List[float] = []
+        self.seen = 0  # entries read, valid or not
+        self.error: Optional[str] = None
+        self.seconds = 0.0
+
+    @property
+    def done(self) -> bool:
+        return self.seen >= self.limit
+
+    def feed(self, chunk: bytes) -> bool:
+        started = time.perf_counter()
+        try:
+            self.parser.feed(chunk)
+            self.read_events()
+        except ParseError as e:
+            self.error = str(e)
+        self.seconds += time.perf_counter() - started
+        return self.done
+
+    def close(self):
+        """End of a complete body; a byte-capped one just stops where it is"""
+        if self.error is not None or self.done:
+            return
+        try:
+            self.parser.close()
+            self.read_events()
+        except ParseError as e:
+            self.error = str(e)
+
+    def read_events(self):
+        for _, element in self.parser.read_events():
+            if self.done:
+                return
+            if local_name(element.tag) in ENTRY_TAGS:
+                self.add_entry(element)
+                element.clear()
+
+    def add_entry(self, element):
+        fields: Dict[str, str] = {}
+        for child in element:
+            name = local_name(child.tag)
+            if name == "link":
+                href = child.get("href")  # Atom: <link rel="alternate" href="..."/>
+                if href is None:
+                    fields.setdefault("link", child.text or "")
+                elif child.get("rel", "alternate") == "alternate":
+                    fields.setdefault("link", href)
+            elif name == "guid":
+                if child.get("isPermaLink", "true") != "false":
+                    fields.setdefault("guid", child.text or "")
+            elif name not in fields:
+                fields[name] = "".join(child.itertext())
+        self.seen += 1
+        published = next((fields[tag] for tag in DATE_TAGS if tag in fields), None)
+        if published:
+            timestamp = parse_feed_date(published)
+            if timestamp is not None:
+                self.entry_times.append(timestamp)
+        title = " ".join(fields.get("title", "").split())
+        link = fields.get("link", "").strip()
+        if not link and fields.get("guid", "").startswith("http"):
+            link = fields["guid"].strip()
+        summary = next((fields[tag] for tag in SUMMARY_TAGS if tag in fields), "")
+        if title and link:
+            self.entries.append((title, link, clean_summary(summary)))
+
+    def digest(self) -> str:
+        """Hash of what was read, so a feed whose first entries didn't change
+        counts as unchanged however far the body was read"""
+        return hashlib.sha1(json.dumps([self.entries, self.entry_times]).encode()).hexdigest()
+
+    def result(self, source_name: str) -> Tuple[List[Dict], List[float], Dict]:
+        """Scored articles, entry times and stats, like parse_entries()"""
+        started = time.perf_counter()
+        articles = score_entries(self.entries, source_name)
+        stats = {
+            "seconds": self.seconds + time.perf_counter() - started,
+            "kept": len(articles),
+            "below_threshold": len(self.entries) - len(articles),
+            "over_limit": 0,  # reading stopped at the limit
+            "invalid": self.seen - len(self.entries),
+        }
+        return articles, self.entry_times, stats
+
+# ============== PARSE WORKERS ==============
+# feedparser (the fallback parser) is CPU heavy, so it runs off the event
+# loop: "thread" (default) keeps the API responsive, "process" also spreads
+# parsing over every core, "inline" parses on the loop like before.
+PARSE_EXECUTOR = os.environ.get("PARSE_EXECUTOR", "thread")
+PARSE_WORKERS = int(os.environ.get("PARSE_WORKERS", str(min(4, os.cpu_count() or 1))))
+parse_executor: Optional[Executor] = None
+
+def score_entries(entries: List[Tuple[str, str, str]], source_name: str) -> List[Dict]:
+    """(title, link, summary) -> article records for the relevant ones"""
+    articles = []
+    scores = calculate_relevance_batch([(title, summary) for title, _, summary in entries])
+    for (title, link, summary), relevance in zip(entries, scores):
+        if relevance >= 0.1:  # Only keep somewhat relevant articles
+            articles.append({
+                "title": title,
+                "url": link,
+                "summary": summary,
+                "source": source_name,
+                "relevance": round(relevance, 2),
+                "status": "fetched",
+                "fetched_at": int(time.time())
+            })
     return articles
 
-def generate_posts(article: Dict) -> List[Dict]:
-    """Generate social media posts for an article"""
-    hashtags = "#SouthSudan #Juba #JunubTimes #EastAfrica"
-    posts = []
-    
-    # X (Twitter) post
-    title_short = article["title"][:200]
-    posts.append({
-        "id": len(posts_db) + 1,
-        "article_id": article["id"],
-        "platform": "x",
-        "content": f"{title_short}\n\n{article['url']}\n\n{hashtags}",
-        "status": "pending"
-    })
-    
-    # Facebook post
-    posts.append({
-        "id": len(posts_db) + 2,
-        "article_id": article["id"],
-        "platform": "facebook",
-        "content": f"📰 {article['title']}\n\n{article['summary'][:300]}...\n\n🔗 Read more: {article['url']}\n\n{hashtags}",
-        "status": "pending"
-    })
+def parse_entries(content: bytes, source_name: str) -> Tuple[List[Dict], List[float], Dict]:
+    """Parse a whole feed body with feedparser into scored article records +
+    entry publish times, plus parse time and entry counts for the metrics"""
+    started = time.perf_counter()
+    feed = feedparser.parse(content)
     
-    # Instagram post
-    posts.append({
-        "id": len(posts_db) + 3,
-        "article_id": article["id"],
-        "platform": "instagram",
-        "content": f"🇸🇸 {article['title']}\n\n{article['summary'][:250]}...\n\n📱 Follow @junubtimes for more!\n\n{hashtags} #News #Africa",
-        "status": "pending"
-    })
+    entry_times = []
+    for entry in feed.entries:
+        published = entry.get("published_parsed") or entry.get("updated_parsed")
+        if published:
+            entry_times.append(float(calendar.timegm(published)))
     
-    # TikTok post
-    posts.append({
-        "id": len(posts_db) + 4,
-        "article_id": article["id"],
-        "platform": "tiktok",
-        "content": f"🚨 {article['title'][:100]}\n\nFollow for South Sudan news!\n\n{hashtags} #FYP #NewsUpdate",
-        "status": "pending"
-    })
+    entries = []
+    for entry in feed.entries[:FEED_ENTRY_LIMIT]:
+        title = entry.get("title", "").strip()
+        link = entry.get("link", "").strip()
+        summary = clean_summary(entry.get("summary", ""))
+        if title and link:
+            entries.append((title, link, summary))
     
-    return posts
+    articles = score_entries(entries, source_name)
+    stats = {
+        "seconds": time.perf_counter() - started,
+        "kept": len(articles),
+        "below_threshold": len(entries) - len(articles),
+        "over_limit": max(len(feed.entries) - FEED_ENTRY_LIMIT, 0),
+        "invalid": min(len(feed.entries), FEED_ENTRY_LIMIT) - len(entries),
+    }
+    return articles, entry_times, stats
+
+def get_parse_executor() -> Optional[Executor]:
+    global parse_executor
+    if PARSE_EXECUTOR == "inline":
+        return None
+    if parse_executor is None:
+        if PARSE_EXECUTOR == "process":
+            # spawn, not fork: the parent has a running event loop and threads
+            parse_executor = ProcessPoolExecutor(
+                PARSE_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+        else:
+            parse_executor = ThreadPoolExecutor(PARSE_WORKERS, thread_name_prefix="parse")
+    return parse_executor
+
+async def parse_in_worker(content: bytes, source_name: str) -> Tuple[List[Dict], List[float], Dict]:
+    """Ship the raw body to a parse worker, get scored articles back"""
+    executor = get_parse_executor()
+    if executor is None:
+        return parse_entries(content, source_name)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, parse_entries, content, source_name)
+
+# ============== FEED CACHE ==============
+# Per-source HTTP validators + content hash so unchanged feeds skip scoring
+# and merging. result is "miss" (parsed), "not_modified" (304), "unchanged"
+# (same entries) or "error".
+feed_cache: Dict[str, Dict] = {}
+last_fetch_summary: Dict = {}
+
+def cache_entry(source_name: str) -> Dict:
+    if source_name not in feed_cache:
+        feed_cache[source_name] = {
+            "source": source_name,
+            "etag": None,
+            "last_modified": None,
+            "content_hash": None,
+            "content_bytes": 0,
+            "hits": 0,
+            "misses": 0,
+            "errors": 0,
+            "bytes_saved": 0,
+            "last_result": None,
+            "entry_times": [],
+        }
+    return feed_cache[source_name]
+
+def conditional_headers(cache: Dict) -> Dict[str, str]:
+    headers = {}
+    if cache["etag"]:
+        headers["If-None-Match"] = cache["etag"]
+    if cache["last_modified"]:
+        headers["If-Modified-Since"] = cache["last_modified"]
+    return headers
+
+def remember_body(cache: Dict, response: httpx.Response, content_hash: str, size: int):
+    """Store validators with the hash of the body they describe, only once
+    that body is parsed; earlier, a failed parse would turn into 304s and
+    the content would never be ingested"""
+    cache["etag"] = response.headers.get("etag")
+    cache["last_modified"] = response.headers.get("last-modified")
+    cache["content_hash"] = content_hash
+    cache["content_bytes"] = size
+
+def record_cache_result(cache: Dict, result: str, saved: int = 0):
+    cache["last_result"] = result
+    fetch_results.inc(source=cache["source"], result=result)
+    if result in ("not_modified", "unchanged"):
+        cache["hits"] += 1
+        cache["bytes_saved"] += saved
+    elif result == "miss":
+        cache["misses"] += 1
+    else:
+        cache["errors"] += 1
+
+async def drain(response: httpx.Response, body):
+    """Read out a short rest of the body (FEED_DRAIN_BYTES) so the
+    connection can be reused; a longer one is cheaper to drop"""
+    length = response.headers.get("content-length", "")
+    if length.isdigit() and int(length) - response.num_bytes_downloaded > FEED_DRAIN_BYTES:
+        return
+    budget = response.num_bytes_downloaded + FEED_DRAIN_BYTES
+    async for _ in body:
+        if response.num_bytes_downloaded > budget:
+            return
+
+async def read_feed(response: httpx.Response) -> Tuple[FeedStream, Optional[bytes], int, Optional[str]]:
+    """Pull a feed body through a FeedStream chunk by chunk.
+
+    Returns the stream, the body read so far if the stream failed (for the
+    feedparser fallback), the bytes read and why reading stopped early:
+    "entry_limit", "byte_cap" or None.
+    """
+    stream = FeedStream()
+    chunks: List[bytes] = []  # kept for the fallback, bounded by FEED_MAX_BYTES
+    size = 0
+    stopped = None
+    body = response.aiter_bytes()
+    async for chunk in body:
+        capped = size + len(chunk) > FEED_MAX_BYTES
+        if capped:
+            chunk = chunk[:FEED_MAX_BYTES - size]
+        size += len(chunk)
+        chunks.append(chunk)
+        if stream.error is None:
+            with span("parse", bytes=len(chunk)):
+                done = stream.feed(chunk)
+            if done:
+                with span("drain"):
+                    await drain(response, body)
+                return stream, None, size, "entry_limit"
+        if capped:
+            stopped = "byte_cap"
+            break
+    if stopped is None:
+        stream.close()
+    return stream, b"".join(chunks) if stream.error is not None else None, size, stopped
+
+async def fetch_rss(url: str, source_name: str) -> List[Dict]:
+    cache = cache_entry(source_name)
+    try:
+        started = time.perf_counter()
+        with span("download", url=url) as download:
+            async with get_http_client().stream("GET", url, headers=conditional_headers(cache),
+                                                extensions=http_extensions()) as response:
+                download.set(status=response.status_code)
+                fetch_responses.inc(source=source_name, status=str(response.status_code))
+                if response.status_code == 304:
+                    fetch_seconds.observe(time.perf_counter() - started, source=source_name)
+                    record_cache_result(cache, "not_modified", cache["content_bytes"])
+                    return []
+                if response.is_error:
+                    raise RuntimeError(f"HTTP {response.status_code}")
+                stream, body, size, stopped = await read_feed(response)
+            download.set(bytes=size, stopped=stopped)
+        fetch_seconds.observe(time.perf_counter() - started, source=source_name)
+        fetch_bytes.inc(size, source=source_name)
+        if stopped:
+            feed_truncated.inc(source=source_name, reason=stopped)
+        
+        if body is None:
+            content_hash = stream.digest()
+        else:
+            print(f"↩️  {source_name}: {stream.error}, parsing with feedparser")
+            parse_fallbacks.inc(source=source_name)
+            content_hash = hashlib.sha1(body).hexdigest()
+        if content_hash == cache["content_hash"]:
+            remember_body(cache, response, content_hash, size)
+            record_cache_result(cache, "unchanged")
+            return []
+        
+        if body is None:
+            with span("score", entries=len(stream.entries)):
+                articles, cache["entry_times"], stats = stream.result(source_name)
+        else:
+            with span("feedparser", bytes=size) as parse:
+                articles, cache["entry_times"], stats = await parse_in_worker(body, source_name)
+                parse.set(worker_seconds=round(stats["seconds"], 6))  # the rest is executor queueing
+        parse_seconds.observe(stats.pop("seconds"), source=source_name)
+        for outcome, count in stats.items():
+            entries_total.inc(count, source=source_name, outcome=outcome)
+        remember_body(cache, response, content_hash, size)
+        record_cache_result(cache, "miss")
+        return articles
+    except Exception as e:
+        record_cache_result(cache, "error")
+        if isinstance(e, httpx.HTTPError):
+            fetch_responses.inc(source=source_name, status="error")
+        print(f"Error fetching {source_name}: {e}")
+        return []
+
+def summarize_fetch(sources: List[Tuple[str, str]], started: float) -> Dict:
+    """Per-source cache outcome of the last cycle plus running totals"""
+    per_source = {}
+    totals = {"miss": 0, "not_modified": 0, "unchanged": 0, "error": 0, "pending": 0}
+    for source_name, _ in sources:
+        cache = cache_entry(source_name)
+        result = cache["last_result"] or "pending"
+        totals[result] += 1
+        per_source[source_name] = {
+            "result": result,
+            "hits": cache["hits"],
+            "misses": cache["misses"],
+            "errors": cache["errors"],
+            "bytes_saved": cache["bytes_saved"],
+        }
+    return {
+        "finished_at": datetime.utcnow().isoformat(),
+        "duration": round(time.monotonic() - started, 2),
+        "totals": totals,
+        "sources": per_source,
+    }
+
+# ============== NEAR-DUPLICATES ==============
+# The overlapping Google News queries return the same wire story under
+# different redirect URLs and publisher suffixes. Each story is kept once:
+# the best-scoring copy is the cluster's article (its id is the cluster id)
+# and the other copies are listed in its "duplicates".
+NEAR_DUP_THRESHOLD = float(os.environ.get("NEAR_DUP_THRESHOLD", "0.6"))
+MAX_DUPLICATES_LISTED = 20
+PUBLISHER_SUFFIX_RE = re.compile(r"\s+[-|]\s+[^-|]{1,60}$")
+
+class DuplicateIndex:
+    """MinHash signatures with LSH banding over normalized title + summary.
+
+    Only articles sharing a band bucket are compared, so a lookup costs a
+    few dict hits instead of a pass over the store. 32 hashes in 8 bands of
+    4 catch pairs above ~0.6 Jaccard similarity.
+    """
+    PRIME = (1 << 61) - 1
+
+    def __init__(self, num_perm: int = 32, bands: int = 8, threshold: float = NEAR_DUP_THRESHOLD):
+        rng = random.Random(1)  # fixed so signatures are stable across restarts
+        self.perms = [(rng.randrange(1, self.PRIME), rng.randrange(self.PRIME)) for _ in range(num_perm)]
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.signatures: Dict[int, array] = {}
+        self.buckets: Dict[tuple, List[int]] = {}
+        self.urls: Dict[str, int] = {}  # duplicate URL -> cluster article id
+        self.ready = False
+        self.pending: Optional[List[tuple]] = None  # store changes queued during a rebuild
+
+    def features(self, title: str, summary: str) -> set:
+        title = PUBLISHER_SUFFIX_RE.sub("", title)
+        tokens = tokenize(f"{title} {strip_html(summary)}")
+        return {zlib.crc32(token.encode()) for token in tokens}
+
+    def signature(self, title: str, summary: str) -> Optional[array]:
+        features = self.features(title, summary)
+        if not features:
+            return None
+        prime = self.PRIME
+        return array("Q", (min((a * f + b) % prime for f in features) for a, b in self.perms))
+
+    def band_keys(self, signature: array) -> List[tuple]:
+        rows = self.rows
+        return [(band,) + tuple(signature[band * rows:(band + 1) * rows]) for band in range(self.bands)]
+
+    def find(self, signature: Optional[array]) -> Optional[int]:
+        """Id of the most similar indexed article above the threshold"""
+        if signature is None:
+            return None
+        best_id, best_score = None, self.threshold
+        seen = set()
+        for key in self.band_keys(signature):
+            for candidate in self.buckets.get(key, ()):
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+                other = self.signatures[candidate]
+                score = sum(1 for x, y in zip(signature, other) if x == y) / len(signature)
+                if score >= best_score:
+                    best_id, best_score = candidate, score
+        return best_id
+
+    def add(self, article_id: int, signature: Optional[array]):
+        if signature is None:
+            return
+        self.signatures[article_id] = signature
+        for key in self.band_keys(signature):
+            self.buckets.setdefault(key, []).append(article_id)
+
+    def clear(self):
+        self.signatures, self.buckets, self.urls = {}, {}, {}
+        self.ready = False
+
+    def rebuild(self, articles: List[Dict]):
+        """Index already stored articles (warm start), run off the event loop
+        between start_rebuild() and finish_rebuild()"""
+        for article in articles:
+            self.add(article["id"], self.signature(article["title"], article["summary"]))
+            for _, url in article.get("duplicates", ()):
+                self.urls[url] = article["id"]
+
+    def start_rebuild(self):
+        self.pending = []
+
+    def finish_rebuild(self, built: bool):
+        """Replay the changes made while rebuild() ran, in order"""
+        pending, self.pending = self.pending, None
+        self.ready = built
+        if built:
+            for change in pending:
+                self.on_change(*change)
+
+    def remove(self, article: Dict):
+        """Forget an evicted article: its signature, buckets and duplicate URLs"""
+        signature = self.signatures.pop(article["id"], None)
+        if signature is not None:
+            for key in self.band_keys(signature):
+                bucket = self.buckets.get(key)
+                if bucket is not None:
+                    bucket.remove(article["id"])
+                    if not bucket:
+                        del self.buckets[key]
+        for _, url in article.get("duplicates", ()):
+            if self.urls.get(url) == article["id"]:
+                del self.urls[url]
+
+    def on_change(self, action: str, record: Dict, changes: Dict, previous: Dict):
+        """Store listener: drop removed articles"""
+        if self.pending is not None:
+            self.pending.append((action, record, changes, previous))
+        elif action == "removed":
+            self.remove(record)
+
+near_duplicates = DuplicateIndex()
+articles_db.listeners.append(near_duplicates.on_change)
+
+def fold_duplicate(cluster: Dict, article: Dict):
+    """Record article as another copy of cluster, promoting it if it scores higher"""
+    near_duplicates.urls[article["url"]] = cluster["id"]
+    duplicates = list(cluster.get("duplicates", ()))
+    if article["relevance"] > cluster["relevance"] and cluster["status"] == "fetched":
+        duplicates.append((cluster["source"], cluster["url"]))
+        near_duplicates.urls[cluster["url"]] = cluster["id"]
+        articles_db.update(
+            cluster["id"],
+            title=article["title"],
+            url=article["url"],
+            summary=article["summary"],
+            source=article["source"],
+            relevance=article["relevance"],
+            duplicates=duplicates[-MAX_DUPLICATES_LISTED:],
+        )
+    else:
+        duplicates.append((article["source"], article["url"]))
+        articles_db.update(cluster["id"], duplicates=duplicates[-MAX_DUPLICATES_LISTED:])
+
+# ============== SCHEDULER ==============
+# Each source is polled on its own cadence, learned from how often its
+# entries are published and whether our last polls found anything new.
+# Failing sources back off exponentially (with jitter); a source that keeps
+# failing is circuit-broken for a cooldown. Breakers are per source, not per
+# host: ~40 Google News queries share one host, and a few bad queries must
+# not block the rest.
+SCHEDULER_ENABLED = os.environ.get("SCHEDULER_ENABLED", "1") == "1"
+SCHEDULER_TICK = float(os.environ.get("SCHEDULER_TICK", "15"))
+POLL_MIN_INTERVAL = float(os.environ.get("POLL_MIN_INTERVAL", "120"))
+POLL_MAX_INTERVAL = float(os.environ.get("POLL_MAX_INTERVAL", "21600"))
+POLL_DEFAULT_INTERVAL = float(os.environ.get("POLL_DEFAULT_INTERVAL", "600"))
+BACKOFF_BASE = float(os.environ.get("BACKOFF_BASE", "60"))
+BACKOFF_MAX = float(os.environ.get("BACKOFF_MAX", "3600"))
+CIRCUIT_THRESHOLD = int(os.environ.get("CIRCUIT_THRESHOLD", "3"))
+CIRCUIT_COOLDOWN = float(os.environ.get("CIRCUIT_COOLDOWN", "600"))
+
+class SourceScheduler:
+    """Per-source poll intervals and circuit breakers"""
+
+    def __init__(self):
+        self.sources: Dict[str, Dict] = {}
+
+    def source(self, source_name: str) -> Dict:
+        if source_name not in self.sources:
+            self.sources[source_name] = {
+                "interval": POLL_DEFAULT_INTERVAL,
+                "next_due": 0.0,
+                "failures": 0,
+                "last_polled": None,
+                "last_outcome": None,
+                "trips": 0,
+                "open_until": 0.0,
+            }
+        return self.sources[source_name]
+
+    def circuit_open(self, source_name: str, now: float) -> bool:
+        """Open circuits block the source; once the cooldown passes it is
+        half-open, and its one next poll decides whether it closes again."""
+        return self.source(source_name)["open_until"] > now
+
+    def due(self, sources: List[Tuple[str, str]], now: float) -> List[Tuple[str, str]]:
+        return [
+            (source_name, url) for source_name, url in sources
+            if self.source(source_name)["next_due"] <= now and not self.circuit_open(source_name, now)
+        ]
+
+    def learned_interval(self, entry_times: List[float]) -> Optional[float]:
+        """Median gap between entry publish times, if the feed has them"""
+        times = sorted(set(entry_times))
+        gaps = [later - earlier for earlier, later in zip(times, times[1:]) if later > earlier]
+        if not gaps:
+            return None
+        return gaps[len(gaps) // 2]
+
+    def observe(self, source_name: str, outcome: str, added: int,
+                entry_times: List[float], now: float):
+        state = self.source(source_name)
+        state["last_polled"] = now
+        state["last_outcome"] = outcome
+        
+        if outcome == "error":
+            state["failures"] += 1
+            delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (state["failures"] - 1))
+            state["next_due"] = now + random.uniform(delay / 2, delay)
+            # failures only reset on success, so a failed half-open poll trips it again
+            if state["failures"] >= CIRCUIT_THRESHOLD and state["open_until"] <= now:
+                state["trips"] += 1
+                cooldown = min(BACKOFF_MAX * 4, CIRCUIT_COOLDOWN * 2 ** (state["trips"] - 1))
+                state["open_until"] = now + cooldown
+                print(f"🔌 Circuit open for {source_name} ({cooldown:.0f}s)")
+            return
+        
+        state["failures"] = 0
+        state["trips"] = 0
+        interval = state["interval"]
+        if outcome == "miss":
+            learned = self.learned_interval(entry_times)
+            if learned is not None:
+                interval = (interval + learned) / 2
+        if added:
+            interval *= 0.75
+        else:
+            interval *= 1.5
+        # move at most 2x per poll so one odd feed snapshot can't swing it
+        interval = max(state["interval"] / 2, min(state["interval"] * 2, interval))
+        state["interval"] = max(POLL_MIN_INTERVAL, min(POLL_MAX_INTERVAL, interval))
+        state["next_due"] = now + state["interval"] * random.uniform(0.9, 1.1)
+
+    def snapshot(self, sources: List[Tuple[str, str]]) -> Dict:
+        now = time.time()
+        schedule = []
+        for source_name, _ in sources:
+            state = self.source(source_name)
+            schedule.append({
+                "source": source_name,
+                "interval": round(state["interval"]),
+                "due_in": max(0, round(state["next_due"] - now)),
+                "failures": state["failures"],
+                "last_outcome": state["last_outcome"],
+                "circuit_open": self.circuit_open(source_name, now),
+                "open_for": max(0, round(state["open_until"] - now)),
+            })
+        return {"enabled": SCHEDULER_ENABLED, "sources": schedule}
+
+scheduler = SourceScheduler()
+scheduler_task: Optional[asyncio.Task] = None
+
+# ============== SEARCH ==============
+# Inverted index over title + summary, kept up to date by a store listener
+# as fetch_all_news inserts articles. Postings are compact arrays (doc
+# numbers + term frequencies). Each document also keeps its token sequence
+# as an array of term ids, which phrases are checked against.
+SEARCH_K1 = 1.2
+SEARCH_B = 0.75
+MAX_PREFIX_EXPANSION = 50
+QUERY_RE = re.compile(r'"([^"]+)"|(\S+)')
+
+def article_text(article: Dict) -> str:
+    return f"{article['title']} {strip_html(article['summary'])}"
+
+class SearchIndex:
+    """BM25 over an append-only inverted index.
+
+    Documents get internal numbers in insertion order, so every posting
+    list stays sorted and can be bisected. Re-indexing an article retires
+    its old number (tombstone) and gives it a new one; tombstones are
+    compacted away once they pile up.
+    """
+
+    def __init__(self):
+        self.postings: Dict[str, Tuple[array, array]] = {}  # term -> (docnos, tfs)
+        self.vocabulary: List[str] = []  # sorted, for prefix queries
+        self.doc_article = array("I")
+        self.doc_length = array("I")
+        self.doc_terms: List[array] = []  # docno -> term ids in text order
+        self.term_ids: Dict[str, int] = {}
+        self.article_doc: Dict[int, int] = {}
+        self.deleted: set = set()
+        self.total_length = 0
+        self.ready = False
+        self.pending: Optional[List[tuple]] = None  # store changes queued during a rebuild
+
+    @property
+    def doc_count(self) -> int:
+        return len(self.article_doc)
+
+    def add(self, article: Dict):
+        if article["id"] in self.article_doc:
+            self.remove(article["id"])
+        docno = len(self.doc_article)
+        tokens = tokenize(article_text(article))
+        self.doc_article.append(article["id"])
+        self.doc_length.append(len(tokens))
+        term_ids = self.term_ids
+        self.doc_terms.append(array("I", (term_ids.setdefault(token, len(term_ids)) for token in tokens)))
+        self.article_doc[article["id"]] = docno
+        self.total_length += len(tokens)
+        
+        counts: Dict[str, int] = {}
+        for token in tokens:
+            counts[token] = counts.get(token, 0) + 1
+        for term, tf in counts.items():
+            posting = self.postings.get(term)
+            if posting is None:
+                posting = self.postings[term] = (array("I"), array("H"))
+                bisect.insort(self.vocabulary, term)
+            posting[0].append(docno)
+            posting[1].append(min(tf, 0xFFFF))
+
+    def remove(self, article_id: int):
+        docno = self.article_doc.pop(article_id, None)
+        if docno is None:
+            return
+        self.deleted.add(docno)
+        self.doc_terms[docno] = array("I")
+        self.total_length -= self.doc_length[docno]
+        if len(self.deleted) > 1000 and len(self.deleted) * 4 > len(self.doc_article):
+            self.compact()
+
+    def compact(self):
+        """Drop tombstoned documents from every posting list"""
+        deleted = self.deleted
+        for term in list(self.postings):
+            docnos, tfs = self.postings[term]
+            keep = [i for i, docno in enumerate(docnos) if docno not in deleted]
+            if not keep:
+                del self.postings[term]
+            elif len(keep) < len(docnos):
+                self.postings[term] = (array("I", (docnos[i] for i in keep)),
+                                       array("H", (tfs[i] for i in keep)))
+        self.vocabulary = sorted(self.postings)
+        self.deleted = set()
+
+    def rebuild(self, articles: List[Dict]):
+        """Index stored articles off the event loop, between start_rebuild()
+        and finish_rebuild()"""
+        for article in articles:
+            self.add(article)
+
+    def start_rebuild(self):
+        self.pending = []
+
+    def finish_rebuild(self, built: bool):
+        """Replay the changes made while rebuild() ran, in order"""
+        pending, self.pending = self.pending, None
+        self.ready = built
+        if built:
+            for change in pending:
+                self.on_change(*change)
+
+    def on_change(self, action: str, record: Dict, changes: Dict, previous: Dict):
+        """Store listener: index new articles, re-index edited text, drop removed ones"""
+        if self.pending is not None:
+            self.pending.append((action, record, changes, previous))
+            return
+        if not self.ready:
+            return
+        if action == "removed":
+            self.remove(record["id"])
+        elif action == "added" or "title" in changes or "summary" in changes:
+            self.add(record)
+
+    def tf(self, term: str, docno: int) -> int:
+        posting = self.postings.get(term)
+        if posting is None:
+            return 0
+        position = bisect.bisect_left(posting[0], docno)
+        if position < len(posting[0]) and posting[0][position] == docno:
+            return posting[1][position]
+        return 0
+
+    def has_phrase(self, docno: int, phrase: array) -> bool:
+        """Whether the document has the phrase's term ids back to back"""
+        terms = self.doc_terms[docno]
+        n = len(phrase)
+        stop = len(terms) - n + 1
+        position = 0
+        while position < stop:
+            try:
+                position = terms.index(phrase[0], position, stop)
+            except ValueError:
+                return False
+            if terms[position:position + n] == phrase:
+                return True
+            position += 1
+        return False
+
+    def expand(self, prefix: str) -> List[str]:
+        start = bisect.bisect_left(self.vocabulary, prefix)
+        terms = []
+        for term in self.vocabulary[start:start + MAX_PREFIX_EXPANSION]:
+            if not term.startswith(prefix):
+                break
+            terms.append(term)
+        return terms
+
+    def parse(self, query: str) -> List[Tuple[str, List[str]]]:
+        """Query -> clauses of ("term"|"phrase"|"prefix", tokens); all must match"""
+        clauses = []
+        for phrase, word in QUERY_RE.findall(query):
+            if phrase:
+                tokens = tokenize(phrase)
+                if tokens:
+                    clauses.append(("phrase" if len(tokens) > 1 else "term", tokens))
+            elif word.endswith("*"):
+                parts = TOKEN_RE.findall(word.lower())
+                if parts:
+                    clauses.extend(("term", [normalize_token(t)]) for t in parts[:-1])
+                    # indexed terms are plural-folded, so fold the prefix too:
+                    # "refugees*" has to reach "refugee"
+                    clauses.append(("prefix", [normalize_token(parts[-1])]))
+            else:
+                tokens = tokenize(word)
+                if len(tokens) > 1:  # "r-arcss" style words act as phrases
+                    clauses.append(("phrase", tokens))
+                elif tokens:
+                    clauses.append(("term", tokens))
+        return clauses
+
+    def search(self, query: str, match: Optional[Callable[[Dict], bool]] = None,
+               limit: int = 20, offset: int = 0) -> Tuple[List[Tuple[float, Dict]], int]:
+        """Ranked (score, article) hits for query and the total match count"""
+        # the posting lists used, taken once: this runs in a worker thread
+        # and compact() may drop terms while it does
+        postings: Dict[str, Tuple[array, array]] = {}
+        clauses = []
+        for kind, tokens in self.parse(query):
+            terms = self.expand(tokens[0]) if kind == "prefix" else list(dict.fromkeys(tokens))
+            for term in terms:
+                posting = self.postings.get(term)
+                if posting is not None:
+                    postings[term] = posting
+            if not all(term in postings for term in terms) or not terms:
+                return [], 0
+            if kind == "phrase":
+                tokens = array("I", (self.term_ids[token] for token in tokens))
+            clauses.append((kind, tokens, terms))
+        if not clauses:
+            return [], 0
+        
+        doc_count = max(self.doc_count, 1)
+        average_length = self.total_length / doc_count or 1.0
+        doc_length = self.doc_length
+        idf = {}
+        for _, _, terms in clauses:
+            for term in terms:
+                df = len(postings[term][0])
+                idf[term] = math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+        
+        def bm25(term: str, tf: int, docno: int) -> float:
+            norm = SEARCH_K1 * (1 - SEARCH_B + SEARCH_B * doc_length[docno] / average_length)
+            return idf[term] * tf * (SEARCH_K1 + 1) / (tf + norm)
+        
+        # Seed candidates from the rarest clause, scored straight off its
+        # postings; the other clauses are looked up per candidate.
+        def clause_size(clause):
+            kind, _, terms = clause
+            sizes = [len(postings[term][0]) for term in terms]
+            return sum(sizes) if kind == "prefix" else min(sizes)
+        clauses.sort(key=clause_size)
+        kind, tokens, terms = clauses[0]
+        candidates: Dict[int, float] = {}
+        if kind == "phrase":
+            rarest = min(terms, key=lambda term: len(postings[term][0]))
+            candidates = dict.fromkeys(postings[rarest][0], 0.0)
+            rest = clauses
+        else:
+            for term in terms:
+                for docno, tf in zip(*postings[term]):
+                    candidates[docno] = candidates.get(docno, 0.0) + bm25(term, tf, docno)
+            rest = clauses[1:]
+        
+        lookups: Dict[str, Callable[[int], int]] = {}
+        for _, _, terms in rest:
+            for term in terms:
+                docnos, tfs = postings[term]
+                if len(candidates) * 4 > len(docnos):
+                    lookups[term] = dict(zip(docnos, tfs)).get
+                else:
+                    lookups[term] = lambda docno, term=term: self.tf(term, docno)
+        
+        hits = []
+        for docno, score in candidates.items():
+            if docno in self.deleted:
+                continue
+            article = articles_db.get(self.doc_article[docno])
+            if article is None or (match is not None and not match(article)):
+                continue
+            for kind, tokens, terms in rest:
+                found = 0
+                for term in terms:
+                    tf = lookups[term](docno)
+                    if tf:
+                        found += 1
+                        score += bm25(term, tf, docno)
+                required = 1 if kind == "prefix" else len(terms)
+                if found < required or (kind == "phrase" and not self.has_phrase(docno, tokens)):
+                    break
+            else:
+                hits.append((score, article))
+        
+        top = heapq.nlargest(offset + limit, hits, key=lambda hit: (hit[0], hit[1]["id"]))
+        return top[offset:], len(hits)
+
+search_index = SearchIndex()
+articles_db.listeners.append(search_index.on_change)
+indexes_lock = asyncio.Lock()
+
+def rebuild_indexes(indexes: List, articles: List[Dict]):
+    for index in indexes:
+        index.rebuild(articles)
+
+async def ensure_indexes():
+    """Build the duplicate and search indexes once after a warm start,
+    off the event loop. Fetches wait for this before merging.
+
+    The article list is snapshotted in the same loop step that starts
+    queueing store changes, so whatever changes while the thread builds
+    is replayed afterwards instead of being lost.
+    """
+    async with indexes_lock:
+        indexes = [index for index in (near_duplicates, search_index) if not index.ready]
+        if not indexes:
+            return
+        for index in indexes:
+            index.start_rebuild()
+        built = False
+        try:
+            await asyncio.to_thread(rebuild_indexes, indexes, list(articles_db))
+            built = True
+        finally:
+            for index in indexes:
+                index.finish_rebuild(built)
+
+# ============== RETENTION ==============
+# The store lives in memory, so it is kept bounded. Unreviewed articles
+# (fetched or rejected) age out after RETENTION_UNREVIEWED_HOURS, posted
+# ones after RETENTION_POSTED_DAYS, and past RETENTION_MAX_ARTICLES the
+# least useful go first: rejected, then the lowest-scoring fetched, then
+# the oldest posted. Approved articles are waiting on a person and are
+# never evicted. Evicted URLs are remembered (as 8-byte hashes) for
+# RETENTION_TOMBSTONE_DAYS so feeds that still list them can't re-add them.
+RETENTION_MAX_ARTICLES = int(os.environ.get("RETENTION_MAX_ARTICLES", "20000"))
+RETENTION_UNREVIEWED_HOURS = float(os.environ.get("RETENTION_UNREVIEWED_HOURS", "72"))
+RETENTION_POSTED_DAYS = float(os.environ.get("RETENTION_POSTED_DAYS", "30"))
+RETENTION_TOMBSTONE_DAYS = float(os.environ.get("RETENTION_TOMBSTONE_DAYS", "7"))
+
+evicted_urls: "OrderedDict[int, float]" = OrderedDict()  # url hash -> evicted at, oldest first
+evicted_pending: List[Tuple[int, float]] = []  # tombstones not persisted yet
+last_eviction: Dict = {}
+
+def url_hash(url: str) -> int:
+    """Signed 64-bit hash, fits an SQLite INTEGER"""
+    return int.from_bytes(hashlib.blake2b(url.encode(), digest_size=8).digest(), "big", signed=True)
+
+def evict_article(article: Article, now: float):
+    """Drop an article and its posts; store listeners clean up the indexes"""
+    for post_id in list(posts_db.ids_where("article_id", article["id"])):
+        posts_db.remove(post_id)
+    articles_db.remove(article["id"])
+    for url in [article["url"]] + [url for _, url in article["duplicates"]]:
+        key = url_hash(url)
+        evicted_urls.pop(key, None)
+        evicted_urls[key] = now
+        evicted_pending.append((key, now))
+
+def aged_out(now: float) -> List[int]:
+    """Ids past their status' age limit. Ids follow fetch order, so the
+    walk stops at the first article younger than the shorter limit."""
+    unreviewed_cutoff = now - RETENTION_UNREVIEWED_HOURS * 3600
+    posted_cutoff = now - RETENTION_POSTED_DAYS * 86400
+    stop = max(unreviewed_cutoff, posted_cutoff)
+    ids = []
+    for article in articles_db:
+        if article["fetched_at"] >= stop:
+            break
+        if article["status"] in ("fetched", "rejected"):
+            if article["fetched_at"] < unreviewed_cutoff:
+                ids.append(article["id"])
+        elif article["status"] == "posted" and article["fetched_at"] < posted_cutoff:
+            ids.append(article["id"])
+    return ids
+
+def over_capacity() -> List[int]:
+    """Ids to drop to get back under RETENTION_MAX_ARTICLES, least useful first"""
+    excess = len(articles_db) - RETENTION_MAX_ARTICLES
+    if excess <= 0:
+        return []
+    candidates = itertools.chain(
+        sorted(articles_db.ids_where("status", "rejected")),
+        (record_id for _, record_id in reversed(articles_db.order)
+         if articles_db.get(record_id)["status"] == "fetched"),
+        sorted(articles_db.ids_where("status", "posted")),
+    )
+    return list(itertools.islice(candidates, excess))
+
+def enforce_retention() -> Dict:
+    """Apply the age and count limits, then forget expired tombstones"""
+    now = time.time()
+    aged = aged_out(now)
+    for article_id in aged:
+        evict_article(articles_db.get(article_id), now)
+    capped = over_capacity()
+    for article_id in capped:
+        evict_article(articles_db.get(article_id), now)
+    expiry = now - RETENTION_TOMBSTONE_DAYS * 86400
+    while evicted_urls and next(iter(evicted_urls.values())) < expiry:
+        evicted_urls.popitem(last=False)
+    last_eviction.update(at=datetime.utcnow().isoformat(), aged=len(aged),
+                         capped=len(capped), tombstones=len(evicted_urls))
+    if aged or capped:
+        print(f"🧹 Evicted {len(aged)} aged and {len(capped)} over-capacity articles")
+    return last_eviction
+
+# ============== FETCH JOBS ==============
+# Every fetch runs as a job. Triggers for sources that are already being
+# fetched join the running job instead of downloading them again.
+MAX_FETCH_JOBS = 50
+
+class FetchJob:
+    """One fetch run over a set of sources, with per-source progress"""
+
+    def __init__(self, sources: List[Tuple[str, str]], job_id: Optional[str] = None):
+        self.id = job_id or uuid.uuid4().hex[:12]
+        self.aliases: List[str] = []  # ids other workers handed out for triggers it covers
+        self.sources = sources
+        self.status = "queued"
+        self.created_at = datetime.utcnow().isoformat()
+        self.started_at: Optional[str] = None
+        self.finished_at: Optional[str] = None
+        self.duration: Optional[float] = None
+        self.coalesced = 0  # later triggers that joined this job
+        self.task: Optional[asyncio.Task] = None
+        self.source_started_at: Dict[str, float] = {}
+        self.progress: Dict[str, Dict] = {
+            source_name: {"state": "pending", "result": None, "elapsed": None,
+                          "fetched": 0, "new": 0, "duplicates": 0}
+            for source_name, _ in sources
+        }
+
+    @property
+    def active(self) -> bool:
+        return self.status in ("queued", "running")
+
+    def source_started(self, source_name: str):
+        self.progress[source_name]["state"] = "running"
+        self.source_started_at[source_name] = time.monotonic()
+
+    def source_finished(self, source_name: str, fetched: int, added: int):
+        progress = self.progress[source_name]
+        started = self.source_started_at.get(source_name, time.monotonic())
+        result = cache_entry(source_name)["last_result"]
+        progress.update(
+            state="error" if result == "error" else "done",
+            result=result,
+            elapsed=round(time.monotonic() - started, 3),
+            fetched=fetched,
+            new=added,
+            duplicates=fetched - added,
+        )
+
+    def to_dict(self) -> Dict:
+        states: Dict[str, int] = {}
+        for progress in self.progress.values():
+            states[progress["state"]] = states.get(progress["state"], 0) + 1
+        return {
+            "id": self.id,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "duration": self.duration,
+            "coalesced": self.coalesced,
+            "states": states,
+            "new": sum(p["new"] for p in self.progress.values()),
+            "duplicates": sum(p["duplicates"] for p in self.progress.values()),
+            "sources": self.progress,
+        }
+
+fetch_jobs: "OrderedDict[str, FetchJob]" = OrderedDict()
 
 # ============== BACKGROUND TASKS ==============
-async def fetch_all_news():
-    """Fetch news from all sources"""
-    print(f"📰 Fetching news at {datetime.utcnow()}")
+def merge_articles(new_articles: List[Dict]) -> int:
+    """Add only new stories (by URL, then near-duplicate text), returns how many were added"""
+    added = 0
+    for article in new_articles:
+        url = article["url"]
+        if articles_db.find("url", url) is not None:
+            dedupe_hits.inc(source=article["source"], kind="url")
+            continue
+        if url in near_duplicates.urls:
+            dedupe_hits.inc(source=article["source"], kind="alias")
+            continue
+        if url_hash(url) in evicted_urls:
+            dedupe_hits.inc(source=article["source"], kind="evicted")
+            continue
+        signature = near_duplicates.signature(article["title"], article["summary"])
+        cluster_id = near_duplicates.find(signature)
+        if cluster_id is not None:
+            dedupe_hits.inc(source=article["source"], kind="near_duplicate")
+            fold_duplicate(articles_db.get(cluster_id), article)
+            continue
+        article = Article.from_dict(article)
+        articles_db.add(article)
+        near_duplicates.add(article["id"], signature)
+        added += 1
+    return added
+
+fetch_limit: Optional[asyncio.Semaphore] = None
+
+async def fetch_source_limited(source_name: str, url: str, job: FetchJob) -> Tuple[str, List[Dict]]:
+    """Fetch one source under the global and per-host concurrency limits"""
+    global fetch_limit
+    if fetch_limit is None:
+        fetch_limit = asyncio.Semaphore(FETCH_CONCURRENCY)
+    with span("source", lane=source_name) as source:
+        queued = time.perf_counter()
+        async with fetch_limit, host_limit(url):
+            source.set(queued_ms=round((time.perf_counter() - queued) * 1000, 2))
+            job.source_started(source_name)
+            return source_name, await fetch_rss(url, source_name)
+
+async def fetch_concurrently(sources: List[Tuple[str, str]], job: FetchJob) -> Dict[str, int]:
+    """Fetch sources in parallel, merging each one as soon as it completes.
+
+    Sources still running when FETCH_CYCLE_DEADLINE expires are cancelled
+    so a single hanging host can't hold up the whole cycle. Returns the
+    number of articles added per finished source.
+    """
+    tasks = [
+        asyncio.create_task(fetch_source_limited(source_name, url, job))
+        for source_name, url in sources
+    ]
+    added = {}
+    try:
+        for next_done in asyncio.as_completed(tasks, timeout=FETCH_CYCLE_DEADLINE):
+            source_name, articles = await next_done
+            with span("merge", source=source_name, articles=len(articles)) as merge:
+                added[source_name] = merge_articles(articles)
+                merge.set(added=added[source_name])
+            job.source_finished(source_name, len(articles), added[source_name])
+    except asyncio.TimeoutError:
+        print(f"⏱️ Fetch deadline hit, {len(tasks) - len(added)} sources unfinished")
+    finally:
+        for task in tasks:
+            task.cancel()
+    return added
+
+@traced("fetch cycle")
+async def fetch_all_news(sources: Optional[List[Tuple[str, str]]] = None,
+                         job: Optional[FetchJob] = None):
+    """Fetch news from all sources (or the given ones), skipping open circuits"""
+    global last_fetch_summary
+    job = job or FetchJob(sources or RSS_SOURCES)
+    job.status = "running"
+    job.started_at = datetime.utcnow().isoformat()
+    now = time.time()
+    sources = []
+    for source_name, url in job.sources:
+        if scheduler.circuit_open(source_name, now):
+            job.progress[source_name]["state"] = "skipped"
+        else:
+            sources.append((source_name, url))
+    print(f"📰 Fetching {len(sources)} sources at {datetime.utcnow()}")
+    annotate(job_id=job.id, sources=len(sources), skipped=len(job.sources) - len(sources))
+    event_log.publish("fetch-started", {"job_id": job.id, "sources": len(sources)})
+    started = time.monotonic()
+    for source_name, _ in sources:
+        cache_entry(source_name)["last_result"] = None
+    with span("indexes"):
+        await ensure_indexes()
     
-    for source_name, url in RSS_SOURCES:
-        new_articles = await fetch_rss(url, source_name)
-        
-        # Add only new articles (check by URL)
-        existing_urls = {a["url"] for a in articles_db}
-        for article in new_articles:
-            if article["url"] not in existing_urls:
-                articles_db.append(article)
+    if FETCH_MODE == "sequential":
+        added = {}
+        for source_name, url in sources:
+            job.source_started(source_name)
+            with span("source", lane=source_name):
+                articles = await fetch_rss(url, source_name)
+            with span("merge", source=source_name, articles=len(articles)):
+                added[source_name] = merge_articles(articles)
+            job.source_finished(source_name, len(articles), added[source_name])
+    else:
+        added = await fetch_concurrently(sources, job)
+    with span("retention"):
+        enforce_retention()
+    with span("persist"):
+        await persist()
+    for progress in job.progress.values():
+        if progress["state"] in ("pending", "running"):
+            progress["state"] = "timeout"
+    
+    now = time.time()
+    for source_name, _ in sources:
+        cache = cache_entry(source_name)
+        outcome = cache["last_result"] if source_name in added else "error"
+        scheduler.observe(source_name, outcome or "error", added.get(source_name, 0),
+                          cache["entry_times"], now)
+    
+    fetch_cycle_seconds.observe(time.monotonic() - started)
+    last_fetch_summary = summarize_fetch(sources, started)
+    totals = last_fetch_summary["totals"]
+    job.status = "done"
+    job.finished_at = datetime.utcnow().isoformat()
+    job.duration = round(time.monotonic() - started, 2)
+    event_log.publish("fetch-finished", {"job_id": job.id, "added": sum(added.values()),
+                                         "totals": totals})
+    print(f"✅ Total articles: {len(articles_db)} ({last_fetch_summary['duration']}s, "
+          f"{totals['not_modified'] + totals['unchanged']} cached, {totals['miss']} parsed, "
+          f"{totals['error']} errors)")
+
+async def run_fetch_job(job: FetchJob):
+    try:
+        if SHARED_STORE:
+            await asyncio.to_thread(storage.save_job, [job.id], job.to_dict(), False)
+        await fetch_all_news(job=job)
+    except asyncio.CancelledError:
+        # lost the lease: the job must not stay "running" for triggers to join
+        job.status = "cancelled"
+        job.finished_at = datetime.utcnow().isoformat()
+        print(f"Fetch job {job.id} cancelled")
+        raise
+    except Exception as e:
+        job.status = "failed"
+        job.finished_at = datetime.utcnow().isoformat()
+        print(f"Fetch job {job.id} failed: {e}")
+    finally:
+        if SHARED_STORE:
+            await asyncio.to_thread(storage.save_job, [job.id] + job.aliases, job.to_dict(), True)
+
+def start_fetch(sources: Optional[List[Tuple[str, str]]] = None, job_id: Optional[str] = None) -> FetchJob:
+    """Start a fetch job, or join the running one(s) that already cover it.
+
+    Sources already being fetched are never downloaded twice: if every
+    requested source is in flight the latest running job is returned,
+    otherwise a new job is started for only the missing sources.
+    """
+    wanted = sources or RSS_SOURCES
+    running = [job for job in fetch_jobs.values()
+               if job.active and not (job.task is not None and job.task.done())]
+    in_flight = {source_name for job in running for source_name in job.progress}
+    missing = [(source_name, url) for source_name, url in wanted if source_name not in in_flight]
+    if not missing:
+        job = running[-1]
+        job.coalesced += 1
+        return job
     
-    print(f"✅ Total articles: {len(articles_db)}")
+    job = FetchJob(missing, job_id)
+    fetch_jobs[job.id] = job
+    while len(fetch_jobs) > MAX_FETCH_JOBS:
+        oldest = next(iter(fetch_jobs.values()))
+        if oldest.active:
+            break
+        fetch_jobs.popitem(last=False)
+    job.task = asyncio.create_task(run_fetch_job(job))
+    return job
+
+def start_fetcher():
+    """Begin ingesting: the scheduler, or a single full fetch without it.
+    Every source starts out due, so the scheduler's first tick is a full fetch."""
+    global scheduler_task
+    if SCHEDULER_ENABLED:
+        scheduler_task = asyncio.create_task(scheduler_loop())
+    else:
+        start_fetch()
+
+async def scheduler_loop():
+    """Poll whichever sources are due, forever"""
+    while True:
+        try:
+            due = scheduler.due(RSS_SOURCES, time.time())
+            if due:
+                # wait() rather than await: a job cancelled under us must not
+                # raise CancelledError into, and end, this loop
+                await asyncio.wait([start_fetch(due).task])
+        except Exception as e:
+            print(f"Scheduler error: {e}")
+        await asyncio.sleep(SCHEDULER_TICK)
+
+# ============== POSTS ==============
+# Articles turn into one post per platform from precompiled templates that
+# respect each platform's character limit. Generation runs on a background
+# queue so bulk requests return at once. Posts for platforms with a
+# publisher go out as "queued" and the publisher loop sends them: batched,
+# under a per-platform rate limit, retried with backoff, then "posted" or
+# "failed". Platforms without a publisher keep the manual flow ("pending",
+# then Mark Posted). Only the fetch lease holder publishes.
+HASHTAGS = "#SouthSudan #Juba #JunubTimes #EastAfrica"
+PUBLISHERS = os.environ.get("PUBLISHERS", "")  # e.g. "x=stub,facebook=webhook"
+PUBLISH_WEBHOOK_URL = os.environ.get("PUBLISH_WEBHOOK_URL", "")
+PUBLISH_RATES = os.environ.get("PUBLISH_RATES", "")  # posts per minute, e.g. "x=5,facebook=30"
+PUBLISH_MAX_ATTEMPTS = int(os.environ.get("PUBLISH_MAX_ATTEMPTS", "5"))
+PUBLISH_RETRY_BASE = float(os.environ.get("PUBLISH_RETRY_BASE", "30"))
+PUBLISH_TICK = 1.0
+GENERATE_BATCH = 25
+
+class PostTemplate:
+    """A platform's post format, parsed once.
+
+    `pattern` uses {title}, {summary}, {url} and {hashtags}. `caps` cut a
+    field to a fixed length first; if the post is still over `limit`,
+    the `shrink` fields are shortened (ending in …) in order until it
+    fits. `url_length` is what the platform counts a link as (X: 23).
+    """
+
+    def __init__(self, pattern: str, limit: int, caps: Optional[Dict[str, int]] = None,
+                 shrink: Tuple[str, ...] = ("summary", "title"), url_length: Optional[int] = None):
+        self.parts = [(literal, field) for literal, field, _, _ in string.Formatter().parse(pattern)]
+        self.fields = [field for _, field in self.parts if field]
+        self.fixed = sum(len(literal) for literal, _ in self.parts)
+        self.limit = limit
+        self.caps = caps or {}
+        self.shrink = [field for field in shrink if field in self.fields]
+        self.url_length = url_length
+
+    def length(self, values: Dict[str, str]) -> int:
+        return self.fixed + sum(self.url_length if field == "url" and self.url_length else len(values[field])
+                                for field in self.fields)
+
+    def render(self, values: Dict[str, str]) -> str:
+        values = {field: values[field][:self.caps[field]] if field in self.caps else values[field]
+                  for field in set(self.fields)}
+        over = self.length(values) - self.limit
+        for field in self.shrink:
+            if over <= 0:
+                break
+            text = values[field]
+            cut = text[:max(len(text) - over - 1, 0)].rstrip() + "…"
+            over -= (len(text) - len(cut)) * self.fields.count(field)
+            values[field] = cut
+        return "".join(literal + (values[field] if field else "") for literal, field in self.parts)
+
+POST_TEMPLATES = {
+    "x": PostTemplate("{title}\n\n{url}\n\n{hashtags}", limit=280, caps={"title": 200}, url_length=23),
+    "facebook": PostTemplate("📰 {title}\n\n{summary}...\n\n🔗 Read more: {url}\n\n{hashtags}",
+                             limit=63206, caps={"summary": 300}),
+    "instagram": PostTemplate("🇸🇸 {title}\n\n{summary}...\n\n📱 Follow @junubtimes for more!\n\n"
+                              "{hashtags} #News #Africa", limit=2200, caps={"summary": 250}),
+    "tiktok": PostTemplate("🚨 {title}\n\nFollow for South Sudan news!\n\n{hashtags} #FYP #NewsUpdate",
+                           limit=2200, caps={"title": 100}),
+}
+DEFAULT_RATES = {"x": 5, "facebook": 30, "instagram": 10, "tiktok": 10}  # posts per minute
+
+def generate_posts(article: Dict) -> List[Dict]:
+    """One post per platform; queued where a publisher is configured"""
+    values = {"title": article["title"], "summary": strip_html(article["summary"]),
+              "url": article["url"], "hashtags": HASHTAGS}
+    return [
+        {
+            "article_id": article["id"],
+            "platform": platform,
+            "content": template.render(values),
+            "status": "queued" if platform in publishers else "pending",
+            "attempts": 0,
+        }
+        for platform, template in POST_TEMPLATES.items()
+    ]
+
+class Publisher:
+    """Sends posts to one platform. publish() takes a batch and returns one
+    result per post: {"ok": True, "external_id": ...} or {"ok": False,
+    "error": ..., "retry": bool}."""
+    batch_size = 1
+
+    def __init__(self, platform: str):
+        self.platform = platform
+
+    async def publish(self, posts: List[Dict]) -> List[Dict]:
+        raise NotImplementedError
+
+class StubPublisher(Publisher):
+    """Local stand-in: appends posts to a JSONL file (PUBLISH_STUB_PATH) and
+    fails a PUBLISH_STUB_FAILURE share of them, to exercise retries"""
+    batch_size = 10
+
+    def __init__(self, platform: str):
+        super().__init__(platform)
+        self.path = os.environ.get("PUBLISH_STUB_PATH",
+                                   os.path.join(os.path.dirname(DB_PATH), "published.jsonl"))
+        self.failure_rate = float(os.environ.get("PUBLISH_STUB_FAILURE", "0"))
+
+    async def publish(self, posts: List[Dict]) -> List[Dict]:
+        results, lines = [], []
+        for post in posts:
+            if random.random() < self.failure_rate:
+                results.append({"ok": False, "error": "stub failure", "retry": True})
+                continue
+            external_id = f"stub-{self.platform}-{post['id']}"
+            lines.append(json.dumps({"id": external_id, "platform": self.platform, "content": post["content"]}))
+            results.append({"ok": True, "external_id": external_id})
+        if lines:
+            await asyncio.to_thread(self.append, lines)
+        return results
+
+    def append(self, lines: List[str]):
+        with open(self.path, "a") as f:
+            f.write("\n".join(lines) + "\n")
+
+class WebhookPublisher(Publisher):
+    """POSTs batches as JSON to PUBLISH_WEBHOOK_URL (Zapier, Buffer, a relay)
+    and expects {"results": [...]} back in the same order, else treats a
+    2xx as success for the whole batch"""
+    batch_size = 20
+
+    def __init__(self, platform: str):
+        super().__init__(platform)
+        if not PUBLISH_WEBHOOK_URL:
+            # every post would only fail after its retries
+            raise RuntimeError(f"PUBLISHERS {platform}=webhook needs PUBLISH_WEBHOOK_URL")
+
+    async def publish(self, posts: List[Dict]) -> List[Dict]:
+        payload = {"platform": self.platform,
+                   "posts": [{"id": p["id"], "article_id": p["article_id"], "content": p["content"]} for p in posts]}
+        try:
+            response = await get_http_client().post(PUBLISH_WEBHOOK_URL, json=payload)
+        except httpx.HTTPError as e:
+            return [{"ok": False, "error": str(e) or type(e).__name__, "retry": True}] * len(posts)
+        if response.is_error:
+            retry = response.status_code == 429 or response.status_code >= 500
+            return [{"ok": False, "error": f"HTTP {response.status_code}", "retry": retry}] * len(posts)
+        try:
+            results = response.json()["results"]
+        except (ValueError, KeyError, TypeError):
+            results = None
+        if not isinstance(results, list) or len(results) != len(posts):
+            return [{"ok": True, "external_id": None}] * len(posts)
+        return results
+
+PUBLISHER_TYPES = {"stub": StubPublisher, "webhook": WebhookPublisher}
+
+def parse_platform_settings(value: str) -> Dict[str, str]:
+    """"x=stub, facebook=webhook" -> {"x": "stub", "facebook": "webhook"}"""
+    pairs = (item.split("=", 1) for item in value.split(",") if "=" in item)
+    return {platform.strip(): setting.strip() for platform, setting in pairs}
+
+publishers: Dict[str, Publisher] = {
+    platform: PUBLISHER_TYPES[kind](platform)
+    for platform, kind in parse_platform_settings(PUBLISHERS).items()
+    if platform in POST_TEMPLATES and kind in PUBLISHER_TYPES
+}
+publish_rates = {platform: float(DEFAULT_RATES[platform]) for platform in POST_TEMPLATES}
+publish_rates.update({platform: float(rate) for platform, rate in parse_platform_settings(PUBLISH_RATES).items()
+                      if platform in publish_rates})
+
+class TokenBucket:
+    """`rate` tokens per minute, bursts up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate / 60
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def available(self) -> int:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return int(self.tokens)
+
+    def take(self, count: int):
+        self.tokens -= count
+
+publish_buckets = {platform: TokenBucket(publish_rates[platform],
+                                         max(1, min(publisher.batch_size, publish_rates[platform])))
+                   for platform, publisher in publishers.items()}
+generation_queue: Optional[asyncio.Queue] = None
+generation_pending: set = set()  # article ids queued, not generated yet
+generation_task: Optional[asyncio.Task] = None
+publisher_task: Optional[asyncio.Task] = None
+publisher_wakeup = asyncio.Event()
+
+def enqueue_generation(article_id: int) -> Optional[str]:
+    """Queue posts for an article, an error message if it can't be"""
+    global generation_queue, generation_task
+    article = articles_db.get(article_id)
+    if article is None:
+        return "Not found"
+    if article["status"] == "posted":
+        return "Already posted"
+    if article_id in generation_pending:
+        return "Already queued"
+    if generation_queue is None:
+        generation_queue = asyncio.Queue()
+    if generation_task is None or generation_task.done():
+        generation_task = asyncio.create_task(generation_loop())
+    generation_pending.add(article_id)
+    generation_queue.put_nowait(article_id)
+    return None
+
+async def generation_loop():
+    """Render posts for queued articles a batch at a time, yielding in between"""
+    while True:
+        batch = [await generation_queue.get()]
+        while len(batch) < GENERATE_BATCH and not generation_queue.empty():
+            batch.append(generation_queue.get_nowait())
+        for article_id in batch:
+            generation_pending.discard(article_id)
+            article = articles_db.get(article_id)
+            if article is None or article["status"] == "posted":
+                continue
+            for post in generate_posts(article):
+                posts_db.add(post)
+            articles_db.update(article_id, status="posted")
+        try:
+            await persist()
+        except Exception as e:
+            print(f"Post generation persist error: {e}")
+        publisher_wakeup.set()
+        await asyncio.sleep(0)
+
+def retry_delay(attempts: int) -> float:
+    return PUBLISH_RETRY_BASE * 2 ** (attempts - 1) * random.uniform(0.8, 1.2)
+
+async def publish_batch(platform: str, publisher: Publisher, posts: List[Dict]):
+    for post in posts:
+        posts_db.update(post["id"], status="publishing")
+    try:
+        results = await publisher.publish(posts)
+    except Exception as e:
+        results = [{"ok": False, "error": str(e) or type(e).__name__, "retry": True}] * len(posts)
+    now = time.time()
+    for post, result in zip(posts, results):
+        attempts = post.get("attempts", 0) + 1
+        if result.get("ok"):
+            posts_db.update(post["id"], status="posted", attempts=attempts, error=None,
+                            external_id=result.get("external_id"), posted_at=datetime.utcnow().isoformat())
+            posts_published.inc(platform=platform, result="posted")
+        elif result.get("retry") and attempts < PUBLISH_MAX_ATTEMPTS:
+            posts_db.update(post["id"], status="queued", attempts=attempts, error=result.get("error"),
+                            next_attempt_at=now + retry_delay(attempts))
+            posts_published.inc(platform=platform, result="retry")
+        else:
+            posts_db.update(post["id"], status="failed", attempts=attempts, error=result.get("error"))
+            posts_published.inc(platform=platform, result="failed")
+
+def due_posts(platform: str, now: float, limit: int) -> List[Dict]:
+    ids = posts_db.ids_where("status", "queued") & posts_db.ids_where("platform", platform)
+    due = [posts_db.get(i) for i in sorted(ids) if posts_db.get(i).get("next_attempt_at", 0) <= now]
+    return due[:limit]
+
+async def publisher_loop():
+    """Send due queued posts, each platform under its own rate limit, forever"""
+    for post_id in list(posts_db.ids_where("status", "publishing")):
+        posts_db.update(post_id, status="queued")  # interrupted mid-send: at least once
+    while True:
+        try:
+            now = time.time()
+            sends = []
+            for platform, publisher in publishers.items():
+                bucket = publish_buckets[platform]
+                batch = due_posts(platform, now, min(publisher.batch_size, bucket.available()))
+                if batch:
+                    bucket.take(len(batch))
+                    sends.append(publish_batch(platform, publisher, batch))
+            if sends:
+                await asyncio.gather(*sends)
+                await persist()
+        except Exception as e:
+            print(f"Publisher error: {e}")
+        publisher_wakeup.clear()
+        try:
+            await asyncio.wait_for(publisher_wakeup.wait(), PUBLISH_TICK)
+        except asyncio.TimeoutError:
+            pass
+
+def start_publisher():
+    global publisher_task
+    if publishers and (publisher_task is None or publisher_task.done()):
+        publisher_task = asyncio.create_task(publisher_loop())
+
+# ============== WORKERS ==============
+# SHARED_STORE=1 lets several worker processes (uvicorn --workers N) serve
+# one SQLite store. Exactly one of them holds the fetch lease and runs the
+# scheduler; the others serve requests, apply every write logged by the
+# other workers within SYNC_INTERVAL, and forward fetch triggers to the
+# leader through the database. Ids come from shared per-table sequences in
+# blocks of ID_BLOCK, so no two workers hand out the same one. When two
+# workers edit the same record, the last write wins.
+SHARED_STORE = os.environ.get("SHARED_STORE", "0") == "1"
+LEASE_TTL = float(os.environ.get("LEASE_TTL", "30"))
+SYNC_INTERVAL = float(os.environ.get("SYNC_INTERVAL", "1"))
+ID_BLOCK = int(os.environ.get("ID_BLOCK", "100"))
+CHANGELOG_KEEP = 100000
+WORKER_ID = f"{socket.gethostname()}-{os.getpid()}"
+BOOT_ID = uuid.uuid4().hex[:8]  # per process start: pids repeat, counters restart
+# SSE ids are only meaningful to the worker and process start that issued
+# them, even with one worker: after a restart the counter starts over
+EVENT_ID_PREFIX = f"{BOOT_ID}-"
+
+is_leader = not SHARED_STORE  # holds the fetch lease (always, with one worker)
+worker_task: Optional[asyncio.Task] = None
+sync_cursor = 0  # changelog position applied so far
+jobs_seen_at = 0.0  # finished fetch jobs already announced on this worker
+
+def id_allocator(table: str) -> Callable[[], int]:
+    block = iter(())
+
+    def allocate() -> int:
+        nonlocal block
+        record_id = next(block, None)
+        if record_id is None:
+            block = iter(storage.allocate_ids(table, ID_BLOCK))
+            record_id = next(block)
+        return record_id
+    return allocate
+
+def join_workers():
+    """Share the store: log writes, allocate ids from the database, and
+    remember where the changelog is before the stores are loaded"""
+    global sync_cursor, jobs_seen_at
+    if not isinstance(storage, SQLiteBackend):
+        raise RuntimeError("SHARED_STORE=1 needs STORAGE_BACKEND=sqlite")
+    storage.share(WORKER_ID)
+    sync_cursor = storage.change_cursor()
+    jobs_seen_at = time.time()
+    articles_db.allocate = id_allocator("articles")
+    posts_db.allocate = id_allocator("posts")
+
+def apply_change(table: str, record_id: int, data: Optional[Dict]):
+    """Mirror another worker's write; listeners (SSE, search) fire as usual
+    but the record isn't marked for this worker to persist again"""
+    store = articles_db if table == "articles" else posts_db
+    current = store.get(record_id)
+    was_dirty = record_id in store.dirty
+    if data is None:
+        if current is not None:
+            store.remove(record_id)
+            store.removed.discard(record_id)
+        return
+    if current is None:
+        store.insert(Article.from_dict(data) if table == "articles" else data)
+    else:
+        rendered = as_dict(current)
+        changes = {field: value for field, value in data.items() if rendered.get(field) != value}
+        if changes:
+            store.update(record_id, **changes)
+    if not was_dirty:
+        store.dirty.discard(record_id)
+
+async def resync():
+    """Full reload after falling behind a pruned changelog"""
+    global sync_cursor
+    sync_cursor = await asyncio.to_thread(storage.change_cursor)
+    for table, store in (("articles", articles_db), ("posts", posts_db)):
+        rows = await asyncio.to_thread(storage.load, table)
+        present = set()
+        for data in rows:
+            present.add(data["id"])
+            apply_change(table, data["id"], data)
+        for record_id in [i for i in store.records if i not in present and i not in store.dirty]:
+            apply_change(table, record_id, None)
+
+async def sync_changes():
+    """Apply what the other workers wrote since the last sync"""
+    global sync_cursor
+    while True:
+        changes, cursor, truncated = await asyncio.to_thread(storage.changes_since, sync_cursor)
+        if truncated:
+            print("🔁 Changelog pruned past this worker, reloading the store")
+            return await resync()
+        for change in changes:
+            apply_change(*change)
+        if cursor == sync_cursor:
+            return
+        sync_cursor = cursor
+
+async def become_leader():
+    global is_leader
+    is_leader = True
+    print(f"👑 Worker {WORKER_ID} took the fetch lease")
+    # rebuilt from the shared store before the next merge; the lock keeps
+    # this from landing in the middle of a rebuild
+    async with indexes_lock:
+        near_duplicates.clear()
+    evicted_urls.clear()
+    evicted_urls.update(await asyncio.to_thread(storage.load_evicted))
+    start_fetcher()
+    start_publisher()
+
+def step_down():
+    global is_leader
+    is_leader = False
+    print(f"⚠️ Worker {WORKER_ID} lost the fetch lease")
+    if scheduler_task is not None:
+        scheduler_task.cancel()
+    if publisher_task is not None:
+        publisher_task.cancel()
+    for job in fetch_jobs.values():
+        if job.active and job.task is not None:
+            job.task.cancel()
+
+async def run_fetch_requests():
+    """Leader: start the fetches other workers were asked for"""
+    for job_id, names in await asyncio.to_thread(storage.take_fetch_requests):
+        sources = [(name, url) for name, url in RSS_SOURCES if name in names] or RSS_SOURCES
+        job = start_fetch(sources, job_id)
+        if job.id != job_id:
+            # joined a running job: record the alias now, or the requesting
+            # worker answers "Not found" until the job finishes
+            job.aliases.append(job_id)
+            await asyncio.to_thread(storage.save_job, [job_id], job.to_dict(), not job.active)
+
+async def announce_finished_jobs():
+    """Follower: pass the leader's fetch-finished on to this worker's SSE clients"""
+    global jobs_seen_at
+    for job_id, data, updated_at in await asyncio.to_thread(storage.jobs_finished_since, jobs_seen_at):
+        event_log.publish("fetch-finished", {"job_id": job_id, "added": data["new"]})
+        jobs_seen_at = max(jobs_seen_at, updated_at)
+
+async def worker_loop():
+    """Hold or contend for the fetch lease and keep the stores in sync, forever"""
+    renewed = 0.0
+    while True:
+        try:
+            if time.monotonic() - renewed >= LEASE_TTL / 3:
+                renewed = time.monotonic()
+                holds = await asyncio.to_thread(storage.acquire_lease, "fetch", LEASE_TTL)
+                if holds and not is_leader:
+                    await become_leader()
+                elif is_leader and not holds:
+                    step_down()
+                if is_leader:
+                    await asyncio.to_thread(storage.prune_changelog, CHANGELOG_KEEP)
+            await sync_changes()
+            if is_leader:
+                await run_fetch_requests()
+            else:
+                await announce_finished_jobs()
+        except Exception as e:
+            print(f"Worker sync error: {e}")
+        await asyncio.sleep(SYNC_INTERVAL)
 
 # ============== DASHBOARD HTML ==============
 DASHBOARD_HTML = """
@@ -239,7 +2967,7 @@ DASHBOARD_HTML = """
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Junub Times Dashboard</title>
-    <script src="https://cdn.tailwindcss.com"></script>
+    <link rel="stylesheet" href="__DASHBOARD_CSS__">
     <script src="https://unpkg.com/vue@3/dist/vue.global.prod.js"></script>
     <style>[v-cloak] { display: none; }</style>
 </head>
@@ -266,19 +2994,19 @@ DASHBOARD_HTML = """
             <div class="grid grid-cols-2 md:grid-cols-4 gap-4 mb-8">
                 <div class="bg-white rounded-xl shadow p-6 text-center">
                     <p class="text-gray-500 text-sm">Total Articles</p>
-                    <p class="text-3xl font-bold text-blue-600">{{ articles.length }}</p>
+                    <p class="text-3xl font-bold text-blue-600">{{ stats.articles.total }}</p>
                 </div>
                 <div class="bg-white rounded-xl shadow p-6 text-center">
                     <p class="text-gray-500 text-sm">Approved</p>
-                    <p class="text-3xl font-bold text-green-600">{{ articles.filter(a => a.status === 'approved').length }}</p>
+                    <p class="text-3xl font-bold text-green-600">{{ stats.articles.by_status.approved || 0 }}</p>
                 </div>
                 <div class="bg-white rounded-xl shadow p-6 text-center">
                     <p class="text-gray-500 text-sm">Pending Posts</p>
-                    <p class="text-3xl font-bold text-yellow-600">{{ posts.filter(p => p.status === 'pending').length }}</p>
+                    <p class="text-3xl font-bold text-yellow-600">{{ stats.posts.by_status.pending || 0 }}</p>
                 </div>
                 <div class="bg-white rounded-xl shadow p-6 text-center">
                     <p class="text-gray-500 text-sm">Published</p>
-                    <p class="text-3xl font-bold text-purple-600">{{ posts.filter(p => p.status === 'posted').length }}</p>
+                    <p class="text-3xl font-bold text-purple-600">{{ stats.posts.by_status.posted || 0 }}</p>
                 </div>
             </div>
 
@@ -296,10 +3024,16 @@ DASHBOARD_HTML = """
 
             <!-- Articles Tab -->
             <div v-if="tab === 'articles'" class="space-y-4">
-                <div class="flex gap-3 mb-4">
+                <div class="flex flex-wrap gap-3 mb-4">
+                    <input v-model="query" @keyup.enter="searchArticles" type="search"
+                           placeholder="🔍 Search e.g. Malakal cholera, &quot;peace talks&quot;, abye*"
+                           class="flex-1 min-w-0 px-4 py-2 rounded-lg border border-gray-300">
                     <button @click="approveTop" class="bg-green-600 text-white px-4 py-2 rounded-lg hover:bg-green-700">
                         ✅ Approve Top 5
                     </button>
+                    <button @click="generateApproved" class="bg-blue-600 text-white px-4 py-2 rounded-lg hover:bg-blue-700">
+                        📝 Generate All Approved
+                    </button>
                 </div>
                 
                 <div v-if="articles.length === 0" class="bg-white rounded-xl p-12 text-center text-gray-500">
@@ -307,13 +3041,14 @@ DASHBOARD_HTML = """
                     <p>No articles yet. Click "Fetch News" to get started!</p>
                 </div>
                 
-                <div v-for="article in sortedArticles" :key="article.id" class="bg-white rounded-xl shadow p-6">
+                <div v-for="article in articles" :key="article.id" class="bg-white rounded-xl shadow p-6">
                     <div class="flex flex-col md:flex-row md:justify-between gap-4">
                         <div class="flex-1">
                             <div class="flex flex-wrap gap-2 mb-2">
                                 <span :class="['px-3 py-1 rounded-full text-xs font-bold', 
                                     article.status === 'approved' ? 'bg-green-100 text-green-800' : 
                                     article.status === 'posted' ? 'bg-purple-100 text-purple-800' : 
+                                    article.status === 'rejected' ? 'bg-red-100 text-red-800' : 
                                     'bg-gray-100 text-gray-800']">
                                     {{ article.status.toUpperCase() }}
                                 </span>
@@ -321,6 +3056,10 @@ DASHBOARD_HTML = """
                                     {{ (article.relevance * 100).toFixed(0) }}% relevant
                                 </span>
                                 <span class="text-sm text-gray-500">{{ article.source }}</span>
+                                <span v-if="article.duplicates?.length" class="text-sm text-gray-400"
+                                      :title="article.duplicates.map(d => d.source).join(', ')">
+                                    +{{ article.duplicates.length }} more
+                                </span>
                             </div>
                             <h3 class="font-semibold text-lg mb-2">{{ article.title }}</h3>
                             <p class="text-gray-600 text-sm">{{ article.summary?.substring(0, 200) }}...</p>
@@ -330,6 +3069,10 @@ DASHBOARD_HTML = """
                                     class="bg-green-600 text-white px-4 py-2 rounded-lg text-sm hover:bg-green-700">
                                 ✅ Approve
                             </button>
+                            <button v-if="article.status === 'fetched'" @click="rejectArticle(article)"
+                                    class="bg-gray-200 px-4 py-2 rounded-lg text-sm hover:bg-gray-300">
+                                ✖ Reject
+                            </button>
                             <button v-if="article.status === 'approved'" @click="generateArticlePosts(article)"
                                     class="bg-blue-600 text-white px-4 py-2 rounded-lg text-sm hover:bg-blue-700">
                                 📝 Generate
@@ -341,6 +3084,11 @@ DASHBOARD_HTML = """
                         </div>
                     </div>
                 </div>
+                
+                <button v-if="articlesCursor" @click="loadMoreArticles"
+                        class="w-full bg-white rounded-xl shadow py-3 text-blue-600 font-medium hover:bg-gray-50">
+                    ⬇️ Load more
+                </button>
             </div>
 
             <!-- Posts Tab -->
@@ -357,9 +3105,13 @@ DASHBOARD_HTML = """
                                 <span class="text-2xl">{{ platformIcon(post.platform) }}</span>
                                 <span class="font-bold uppercase">{{ post.platform }}</span>
                                 <span :class="['px-3 py-1 rounded-full text-xs font-bold',
-                                    post.status === 'posted' ? 'bg-green-100 text-green-800' : 'bg-yellow-100 text-yellow-800']">
+                                    post.status === 'posted' ? 'bg-green-100 text-green-800' :
+                                    post.status === 'failed' ? 'bg-red-100 text-red-800' :
+                                    post.status === 'pending' ? 'bg-yellow-100 text-yellow-800' : 'bg-blue-100 text-blue-800']"
+                                      :title="post.error || ''">
                                     {{ post.status.toUpperCase() }}
                                 </span>
+                                <span v-if="post.attempts > 1" class="text-xs text-gray-400">attempt {{ post.attempts }}</span>
                             </div>
                             <pre class="bg-gray-50 p-4 rounded-lg text-sm whitespace-pre-wrap font-sans">{{ post.content }}</pre>
                         </div>
@@ -368,13 +3120,22 @@ DASHBOARD_HTML = """
                                     class="bg-gray-200 px-4 py-2 rounded-lg text-sm hover:bg-gray-300">
                                 📋 Copy
                             </button>
-                            <button v-if="post.status === 'pending'" @click="markPosted(post)"
+                            <button v-if="post.status === 'failed'" @click="retryPost(post)"
+                                    class="bg-blue-600 text-white px-4 py-2 rounded-lg text-sm hover:bg-blue-700">
+                                🔁 Retry
+                            </button>
+                            <button v-if="post.status === 'pending' || post.status === 'failed'" @click="markPosted(post)"
                                     class="bg-purple-600 text-white px-4 py-2 rounded-lg text-sm hover:bg-purple-700">
                                 ✅ Mark Posted
                             </button>
                         </div>
                     </div>
                 </div>
+                
+                <button v-if="postsCursor" @click="loadMorePosts"
+                        class="w-full bg-white rounded-xl shadow py-3 text-blue-600 font-medium hover:bg-gray-50">
+                    ⬇️ Load more
+                </button>
             </div>
         </main>
 
@@ -392,19 +3153,24 @@ DASHBOARD_HTML = """
             return {
                 tab: 'articles',
                 loading: false,
+                fetchJob: null,
                 toast: null,
                 articles: [],
-                posts: []
-            }
-        },
-        computed: {
-            sortedArticles() {
-                return [...this.articles].sort((a, b) => b.relevance - a.relevance)
+                posts: [],
+                articlesCursor: null,
+                postsCursor: null,
+                query: '',
+                stats: { articles: { total: 0, by_status: {} }, posts: { total: 0, by_status: {} } }
             }
         },
         methods: {
-            async api(url, method = 'GET') {
-                const res = await fetch('/api' + url, { method })
+            async api(url, method = 'GET', body = null) {
+                const options = { method }
+                if (body) {
+                    options.headers = { 'Content-Type': 'application/json' }
+                    options.body = JSON.stringify(body)
+                }
+                const res = await fetch('/api' + url, options)
                 return res.json()
             },
             showToast(msg) {
@@ -416,13 +3182,10 @@ DASHBOARD_HTML = """
             },
             async fetchNews() {
                 this.loading = true
-                await this.api('/fetch', 'POST')
+                const job = await this.api('/fetch', 'POST')
+                this.fetchJob = job.job_id
+                // new articles stream in as events, fetch-finished clears loading
                 this.showToast('🔄 Fetching news...')
-                setTimeout(async () => {
-                    this.articles = await this.api('/articles')
-                    this.loading = false
-                    this.showToast('✅ News fetched!')
-                }, 3000)
             },
             async approveArticle(article) {
                 await this.api('/articles/' + article.id + '/approve', 'POST')
@@ -430,20 +3193,22 @@ DASHBOARD_HTML = """
                 this.showToast('✅ Approved!')
             },
             async approveTop() {
-                const fetched = this.articles.filter(a => a.status === 'fetched')
-                    .sort((a, b) => b.relevance - a.relevance)
-                    .slice(0, 5)
-                for (const article of fetched) {
-                    await this.api('/articles/' + article.id + '/approve', 'POST')
-                    article.status = 'approved'
-                }
-                this.showToast('✅ Top 5 approved!')
+                const res = await this.api('/articles/bulk/approve', 'POST', { query: { top_k: 5 } })
+                this.showToast('✅ Top ' + res.updated + ' approved!')
+            },
+            async rejectArticle(article) {
+                await this.api('/articles/bulk/reject', 'POST', { ids: [article.id] })
+                article.status = 'rejected'
+                this.showToast('🗑️ Rejected')
+            },
+            async generateApproved() {
+                const res = await this.api('/articles/bulk/generate', 'POST', { query: { top_k: 50 } })
+                this.showToast('📝 Generating posts for ' + res.queued + ' articles...')
             },
             async generateArticlePosts(article) {
-                const newPosts = await this.api('/articles/' + article.id + '/generate', 'POST')
-                this.posts = await this.api('/posts')
-                article.status = 'posted'
-                this.showToast('📝 Posts generated!')
+                const res = await this.api('/articles/' + article.id + '/generate', 'POST')
+                if (!res.success) return this.showToast('⚠️ ' + res.error)
+                this.showToast('📝 Generating posts...')
             },
             copyPost(post) {
                 navigator.clipboard.writeText(post.content)
@@ -454,13 +3219,114 @@ DASHBOARD_HTML = """
                 post.status = 'posted'
                 this.showToast('✅ Marked as posted!')
             },
+            async retryPost(post) {
+                const res = await this.api('/posts/' + post.id + '/retry', 'POST')
+                this.showToast(res.success ? '🔁 Queued again' : '⚠️ ' + res.error)
+            },
+            articlesUrl(cursor) {
+                const params = new URLSearchParams()
+                if (this.query) params.set('q', this.query)
+                if (cursor) params.set('cursor', cursor)
+                return (this.query ? '/search?' : '/articles?') + params
+            },
+            async loadArticles() {
+                const page = await this.api(this.articlesUrl(null))
+                this.articles = page.items
+                this.articlesCursor = page.next_cursor
+            },
+            async loadMoreArticles() {
+                const page = await this.api(this.articlesUrl(this.articlesCursor))
+                this.articles.push(...page.items)
+                this.articlesCursor = page.next_cursor
+            },
+            async searchArticles() {
+                this.query = this.query.trim()
+                await this.loadArticles()
+            },
+            async loadPosts() {
+                const page = await this.api('/posts')
+                this.posts = page.items
+                this.postsCursor = page.next_cursor
+            },
+            async loadMorePosts() {
+                const page = await this.api('/posts?cursor=' + this.postsCursor)
+                this.posts.push(...page.items)
+                this.postsCursor = page.next_cursor
+            },
+            async loadStats() {
+                this.stats = await this.api('/stats')
+            },
             async loadData() {
-                this.articles = await this.api('/articles')
-                this.posts = await this.api('/posts')
+                // stats first: events after its event_id are not counted in it yet
+                await this.loadStats()
+                await Promise.all([this.loadArticles(), this.loadPosts()])
+            },
+            bump(byStatus, status, delta) {
+                byStatus[status] = (byStatus[status] || 0) + delta
+            },
+            placeArticle(article) {
+                if (this.query) return
+                if (this.articles.some(a => a.id === article.id)) return
+                const i = this.articles.findIndex(a => a.relevance < article.relevance ||
+                    (a.relevance === article.relevance && a.id < article.id))
+                if (i !== -1) this.articles.splice(i, 0, article)
+                else if (!this.articlesCursor) this.articles.push(article)
+            },
+            placePost(post) {
+                if (!this.posts.some(p => p.id === post.id)) this.posts.unshift(post)
+            },
+            applyChange(list, event) {
+                const item = list.find(x => x.id === event.id)
+                if (item) Object.assign(item, event.changes)
+            },
+            connectEvents() {
+                const source = new EventSource('/api/events?last_event_id=' + this.stats.event_id)
+                const on = (type, handler) => source.addEventListener(type, e => handler(JSON.parse(e.data)))
+                on('article-added', article => {
+                    this.stats.articles.total++
+                    this.bump(this.stats.articles.by_status, article.status, 1)
+                    this.placeArticle(article)
+                })
+                on('article-changed', event => {
+                    if ('status' in event.changes) {
+                        this.bump(this.stats.articles.by_status, event.previous.status, -1)
+                        this.bump(this.stats.articles.by_status, event.changes.status, 1)
+                    }
+                    this.applyChange(this.articles, event)
+                })
+                on('article-removed', event => {
+                    this.stats.articles.total--
+                    this.bump(this.stats.articles.by_status, event.status, -1)
+                    this.articles = this.articles.filter(a => a.id !== event.id)
+                })
+                on('post-added', post => {
+                    this.stats.posts.total++
+                    this.bump(this.stats.posts.by_status, post.status, 1)
+                    this.placePost(post)
+                })
+                on('post-changed', event => {
+                    if ('status' in event.changes) {
+                        this.bump(this.stats.posts.by_status, event.previous.status, -1)
+                        this.bump(this.stats.posts.by_status, event.changes.status, 1)
+                    }
+                    this.applyChange(this.posts, event)
+                })
+                on('post-removed', event => {
+                    this.stats.posts.total--
+                    this.bump(this.stats.posts.by_status, event.status, -1)
+                    this.posts = this.posts.filter(p => p.id !== event.id)
+                })
+                on('fetch-finished', event => {
+                    if (!this.loading || event.job_id !== this.fetchJob) return
+                    this.loading = false
+                    this.showToast('✅ ' + event.added + ' new articles')
+                })
+                on('reset', () => this.loadData())
             }
         },
         async mounted() {
             await this.loadData()
+            this.connectEvents()
         }
     }).mount('#app')
     </script>
@@ -468,56 +3334,649 @@ DASHBOARD_HTML = """
 </html>
 """
 
+# ============== RESPONSES ==============
+COMPRESS_MIN_BYTES = int(os.environ.get("COMPRESS_MIN_BYTES", "1024"))  # smaller bodies go out as is
+GZIP_LEVEL = int(os.environ.get("GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.environ.get("BROTLI_QUALITY", "5"))
+RESPONSE_CACHE_ENTRIES = int(os.environ.get("RESPONSE_CACHE_ENTRIES", "128"))
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+STATIC_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)  # preference order
+ENCODING_SUFFIX = {"br": "-br", "gzip": "-gz"}  # encoded bodies get their own strong ETag
+
+# (tag, negotiated encoding) -> (body, content-coding, media type)
+response_cache: "OrderedDict[tuple, Tuple[bytes, Optional[str], str]]" = OrderedDict()
+
+def json_dumps(data) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+
+def compress(body: bytes, encoding: str, best: bool = False) -> bytes:
+    """`best` for bodies compressed once up front (static assets)"""
+    if encoding == "br":
+        return brotli.compress(body, quality=11 if best else BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=9 if best else GZIP_LEVEL, mtime=0)
+
+def negotiate_encoding(request: Request) -> Optional[str]:
+    """Best supported content-coding by Accept-Encoding q-values, None for identity"""
+    header = request.headers.get("accept-encoding")
+    if not header:
+        return None
+    weights = {}
+    for part in header.split(","):
+        name, _, params = part.partition(";")
+        weight = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[name.strip().lower()] = weight
+    best, best_weight = None, 0.0
+    for encoding in ENCODINGS:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+def matching_etag(request: Request, tag: str) -> Optional[str]:
+    """The If-None-Match entry naming `tag` or one of its encoded variants.
+
+    If-None-Match uses the weak comparison, so W/ prefixes are ignored.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return None
+    if header.strip() == "*":
+        return f'"{tag}"'
+    for entry in header.split(","):
+        entry = entry.strip()
+        value = entry[2:] if entry.startswith("W/") else entry
+        value = value.strip('"')
+        for suffix in ENCODING_SUFFIX.values():
+            if value.endswith(suffix):
+                value = value[:-len(suffix)]
+                break
+        if value == tag:
+            return entry
+    return None
+
+def store_etag(request: Request, *versions) -> str:
+    """Tag for a response fully determined by store versions and the query string"""
+    query = hashlib.blake2b(request.url.query.encode(), digest_size=6).hexdigest()
+    return "-".join([BOOT_ID] + [str(version) for version in versions] + [query])
+
+def tagged_response(tag: str, body: bytes, encoding: Optional[str], media_type: str,
+                    cache_control: str) -> Response:
+    headers = {
+        "ETag": f'"{tag}{ENCODING_SUFFIX.get(encoding, "")}"',
+        "Cache-Control": cache_control,
+        "Vary": "Accept-Encoding",
+    }
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type=media_type, headers=headers)
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control,
+                                              "Vary": "Accept-Encoding"})
+
+def cached_response(request: Request, tag: str, cache_control: str = "no-cache") -> Optional[Response]:
+    """304 if the client has `tag`, the stored body if we rendered it before, else None"""
+    etag = matching_etag(request, tag)
+    if etag is not None:
+        response_cache_results.inc(result="not_modified")
+        return not_modified(etag, cache_control)
+    key = (tag, negotiate_encoding(request))
+    cached = response_cache.get(key)
+    if cached is None:
+        response_cache_results.inc(result="miss")
+        return None
+    response_cache.move_to_end(key)
+    response_cache_results.inc(result="hit")
+    return tagged_response(tag, *cached, cache_control)
+
+def json_response(request: Request, tag: str, data, cache_control: str = "no-cache") -> Response:
+    """Serialize, compress if worth it and remember the body under `tag`"""
+    body = json_dumps(data)
+    requested = negotiate_encoding(request)
+    encoding = requested if requested and len(body) >= COMPRESS_MIN_BYTES else None
+    if encoding:
+        body = compress(body, encoding)
+    response_cache[(tag, requested)] = (body, encoding, "application/json")
+    while len(response_cache) > RESPONSE_CACHE_ENTRIES:
+        response_cache.popitem(last=False)
+    return tagged_response(tag, body, encoding, "application/json", cache_control)
+
+class StaticAsset:
+    """A body served from memory, every encoding built once at startup.
+
+    The URL carries a content hash so browsers can cache it forever.
+    """
+
+    def __init__(self, name: str, body: bytes, media_type: str):
+        self.media_type = media_type
+        self.tag = hashlib.blake2b(body, digest_size=8).hexdigest()
+        stem, extension = os.path.splitext(name)
+        self.url = f"/static/{stem}.{self.tag[:10]}{extension}"
+        self.bodies: Dict[Optional[str], bytes] = {None: body}
+        for encoding in ENCODINGS:
+            compressed = compress(body, encoding, best=True)
+            if len(compressed) < len(body):
+                self.bodies[encoding] = compressed
+
+    def response(self, request: Request, cache_control: str) -> Response:
+        etag = matching_etag(request, self.tag)
+        if etag is not None:
+            return not_modified(etag, cache_control)
+        encoding = negotiate_encoding(request)
+        if encoding not in self.bodies:
+            encoding = None
+        return tagged_response(self.tag, self.bodies[encoding], encoding, self.media_type, cache_control)
+
+def load_asset(filename: str, media_type: str) -> StaticAsset:
+    with open(os.path.join(STATIC_DIR, filename), "rb") as f:
+        return StaticAsset(filename, f.read(), media_type)
+
+dashboard_css = load_asset("dashboard.css", "text/css; charset=utf-8")
+static_assets = {asset.url: asset for asset in (dashboard_css,)}
+dashboard_page = StaticAsset("index.html", DASHBOARD_HTML.replace("__DASHBOARD_CSS__", dashboard_css.url).encode(),
+                             "text/html; charset=utf-8")
+
 # ============== API ROUTES ==============
 @app.get("/", response_class=HTMLResponse)
-async def home():
+async def home(request: Request):
     """Serve the dashboard"""
-    return HTMLResponse(content=DASHBOARD_HTML)
+    return dashboard_page.response(request, "no-cache")
+
+@app.get("/static/{name}")
+async def static_file(name: str, request: Request):
+    """Versioned static assets, cacheable for good"""
+    asset = static_assets.get(f"/static/{name}")
+    if asset is None:
+        return PlainTextResponse("Not found", status_code=404)
+    return asset.response(request, STATIC_CACHE_CONTROL)
+
+def encode_cursor(key: Optional[tuple]) -> Optional[str]:
+    if key is None:
+        return None
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+def decode_cursor(cursor: Optional[str], length: int) -> Optional[tuple]:
+    """A cursor back to its sort key: a list of `length` numbers, else ValueError"""
+    if not cursor:
+        return None
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except ValueError:
+        raise ValueError("Invalid cursor")
+    if (not isinstance(key, list) or len(key) != length
+            or not all(isinstance(part, (int, float)) and not isinstance(part, bool) for part in key)):
+        raise ValueError("Invalid cursor")
+    return tuple(key)
+
+def bad_request(error: str) -> JSONResponse:
+    return JSONResponse({"success": False, "error": error}, status_code=400)
+
+def parse_since(since: Optional[str]) -> Optional[int]:
+    """ISO timestamp (naive means UTC) -> epoch seconds, comparable with fetched_at"""
+    if not since:
+        return None
+    return to_epoch(since)
+
+def filter_ids(store: RecordStore, **filters) -> Optional[set]:
+    """Intersect secondary indexes for the filters that were given"""
+    candidates = None
+    for field, value in filters.items():
+        if value is None:
+            continue
+        ids = store.ids_where(field, value)
+        candidates = ids if candidates is None else candidates & ids
+    return candidates
+
+def query_articles(after: Optional[tuple], limit: int, status: Optional[str] = None,
+                   source: Optional[str] = None, min_relevance: Optional[float] = None,
+                   since: Optional[int] = None) -> Tuple[List[Dict], Optional[tuple]]:
+    """Filtered walk of the relevance index, `since` already normalized"""
+    candidates = filter_ids(articles_db, status=status, source=source)
+    if candidates is not None and not candidates:
+        return [], None
+    return articles_db.page(
+        after=after,
+        limit=limit,
+        candidates=candidates,
+        match=lambda a: (candidates is None or a["id"] in candidates)
+                        and (since is None or a["fetched_at"] >= since),
+        stop=None if min_relevance is None else lambda a: a["relevance"] < min_relevance,
+    )
 
 @app.get("/api/articles")
-async def get_articles():
-    """Get all articles"""
-    return articles_db
+async def get_articles(
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    status: Optional[str] = None,
+    source: Optional[str] = None,
+    min_relevance: Optional[float] = None,
+    since: Optional[str] = None,
+):
+    """Get articles, most relevant first, one page at a time"""
+    tag = store_etag(request, articles_db.version)
+    cached = cached_response(request, tag)
+    if cached is not None:
+        return cached
+    try:
+        items, last_key = query_articles(decode_cursor(cursor, 2), limit, status, source,
+                                         min_relevance, parse_since(since))
+    except ValueError as e:
+        return bad_request(str(e))
+    return json_response(request, tag, {"items": [as_dict(article) for article in items],
+                                        "next_cursor": encode_cursor(last_key)})
 
 @app.get("/api/posts")
-async def get_posts():
-    """Get all posts"""
-    return posts_db
+async def get_posts(
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    status: Optional[str] = None,
+    platform: Optional[str] = None,
+    article_id: Optional[int] = None,
+):
+    """Get posts, newest first, one page at a time"""
+    tag = store_etag(request, posts_db.version)
+    cached = cached_response(request, tag)
+    if cached is not None:
+        return cached
+    try:
+        after = decode_cursor(cursor, 1)
+    except ValueError as e:
+        return bad_request(str(e))
+    candidates = filter_ids(posts_db, status=status, platform=platform, article_id=article_id)
+    if candidates is not None and not candidates:
+        return {"items": [], "next_cursor": None}
+    
+    items, last_key = posts_db.page(
+        after=after,
+        limit=limit,
+        candidates=candidates,
+        match=None if candidates is None else lambda p: p["id"] in candidates,
+    )
+    return json_response(request, tag, {"items": items, "next_cursor": encode_cursor(last_key)})
+
+@app.get("/api/search")
+async def search_articles(
+    request: Request,
+    q: str,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    status: Optional[str] = None,
+    source: Optional[str] = None,
+    since: Optional[str] = None,
+):
+    """Full-text search: words, "exact phrases" and prefix* (all must match)"""
+    try:
+        offset = int(decode_cursor(cursor, 1)[0]) if cursor else 0
+        if offset < 0:
+            raise ValueError("Invalid cursor")
+        since = parse_since(since)
+    except ValueError:
+        return bad_request("Invalid cursor or since")
+    tag = store_etag(request, articles_db.version)
+    cached = cached_response(request, tag)
+    if cached is not None:
+        return cached
+    await ensure_indexes()
+    # scoring a common word over 100k articles takes a few hundred ms, so it
+    # runs off the loop; the index only ever appends or swaps whole arrays
+    # while a search reads it
+    hits, total = await asyncio.to_thread(
+        search_index.search,
+        q,
+        match=lambda a: (status is None or a["status"] == status)
+                        and (source is None or a["source"] == source)
+                        and (since is None or a["fetched_at"] >= since),
+        limit=limit,
+        offset=offset,
+    )
+    next_offset = offset + len(hits)
+    return json_response(request, tag, {
+        "items": [dict(as_dict(article), score=round(score, 3)) for score, article in hits],
+        "total": total,
+        "next_cursor": encode_cursor((next_offset,)) if next_offset < total else None,
+    })
+
+@app.get("/api/stats")
+async def get_stats(request: Request):
+    """Dashboard counters, read straight off the store indexes"""
+    tag = store_etag(request, articles_db.version, posts_db.version, event_log.last_id)
+    cached = cached_response(request, tag)
+    if cached is not None:
+        return cached
+    return json_response(request, tag, {
+        "event_id": f"{EVENT_ID_PREFIX}{event_log.last_id}",
+        "articles": {"total": len(articles_db), "by_status": articles_db.counts("status")},
+        "posts": {
+            "total": len(posts_db),
+            "by_status": posts_db.counts("status"),
+            "by_platform": posts_db.counts("platform"),
+        },
+    })
+
+def deep_size(obj, seen: set) -> int:
+    """Bytes held by obj and everything it references, each object counted once"""
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_size(key, seen) + deep_size(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+        size += sum(deep_size(item, seen) for item in obj)
+    elif isinstance(obj, Article):
+        size += sum(deep_size(getattr(obj, slot, None), seen) for slot in Article.__slots__)
+    return size
+
+def process_rss() -> Optional[int]:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+MEMORY_SAMPLE = 500
+
+@app.get("/api/memory")
+async def get_memory():
+    """Approximate memory held by the stores and indexes, in bytes.
+
+    Records are sized from a sample; articles are also sized as plain
+    dicts (the JSON shape) to show what the compact form saves.
+    """
+    def records(store: RecordStore) -> Dict:
+        sample = list(itertools.islice(store, MEMORY_SAMPLE))
+        per_record = deep_size(sample, set()) / len(sample) if sample else 0
+        return {"count": len(store), "per_record": round(per_record),
+                "total": round(per_record * len(store))}
+
+    articles = records(articles_db)
+    sample = [json.loads(json.dumps(as_dict(a))) for a in itertools.islice(articles_db, MEMORY_SAMPLE)]
+    articles["per_record_as_dict"] = round(deep_size(sample, set()) / len(sample)) if sample else 0
+
+    # references into the stores themselves aren't counted again
+    shared = {id(record) for record in articles_db} | {id(record) for record in posts_db}
+    def size(*parts) -> int:
+        return deep_size(parts, set(shared)) - sys.getsizeof(parts)
+
+    return {
+        "articles": articles,
+        "posts": records(posts_db),
+        "indexes": {
+            "articles_unique": size(articles_db.unique),
+            "articles_secondary": size(articles_db.indexes),
+            "articles_order": size(articles_db.order),
+            "posts": size(posts_db.unique, posts_db.indexes, posts_db.order),
+            "search": size(search_index.postings, search_index.vocabulary, search_index.doc_article,
+                           search_index.doc_length, search_index.doc_terms, search_index.term_ids,
+                           search_index.article_doc, search_index.deleted),
+            "near_duplicates": size(near_duplicates.signatures, near_duplicates.buckets,
+                                    near_duplicates.urls),
+        },
+        "event_log": size(event_log.events),
+        "tombstones": {"count": len(evicted_urls), "bytes": size(evicted_urls)},
+        "process_rss": process_rss(),
+        "retention": {
+            "max_articles": RETENTION_MAX_ARTICLES,
+            "unreviewed_hours": RETENTION_UNREVIEWED_HOURS,
+            "posted_days": RETENTION_POSTED_DAYS,
+            "tombstone_days": RETENTION_TOMBSTONE_DAYS,
+            "last_eviction": last_eviction,
+        },
+    }
+
+@app.get("/api/metrics")
+async def get_metrics():
+    """Prometheus text exposition; store and index sizes are read at scrape time"""
+    store_size.values.clear()
+    for table, store in (("articles", articles_db), ("posts", posts_db)):
+        for status, count in store.counts("status").items():
+            store_size.set(count, table=table, status=status)
+    index_size.set(len(search_index.article_doc), index="search_documents")
+    index_size.set(len(search_index.postings), index="search_terms")
+    index_size.set(len(near_duplicates.signatures), index="near_duplicate_signatures")
+    index_size.set(len(near_duplicates.urls), index="duplicate_urls")
+    index_size.set(len(evicted_urls), index="evicted_urls")
+    index_size.set(len(event_log.events), index="events")
+    body = "\n".join(metric.render() for metric in metrics_registry) + "\n"
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
+
+@app.get("/api/trace")
+async def get_trace(cycles: int = Query(TRACE_CYCLES, ge=1)):
+    """Last fetch cycles (and the running one) as Chrome trace JSON, for
+    chrome://tracing or ui.perfetto.dev. With shared workers only the
+    lease holder fetches, so only its traces have cycles."""
+    if not TRACE_FETCH:
+        return {"success": False, "error": "Tracing is off, start with TRACE_FETCH=1"}
+    recorded = list(traces)[-cycles:]
+    if active_trace is not None:
+        recorded.append(active_trace)
+    events = [event for pid, trace in enumerate(recorded, 1) for event in trace.chrome_events(pid)]
+    filename = f"junub-trace-{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}.json"
+    return Response(content=json_dumps({"traceEvents": events, "displayTimeUnit": "ms"}),
+                    media_type="application/json",
+                    headers={"Content-Disposition": f'attachment; filename="{filename}"'})
+
+def parse_event_id(value: str) -> Optional[int]:
+    """Cursor from a client's last event id, -1 if another worker or an
+    earlier start of this one issued it"""
+    if not value:
+        return None
+    if not value.startswith(EVENT_ID_PREFIX):
+        return -1
+    number = value[len(EVENT_ID_PREFIX):]
+    return int(number) if number.isdigit() else None
+
+@app.get("/api/events")
+async def stream_events(request: Request, last_event_id: Optional[str] = None):
+    """Server-Sent Events: article-added/changed/removed, post-*, fetch-*.
+
+    Resumes after the Last-Event-ID header (sent by EventSource on
+    reconnect) or ?last_event_id=, otherwise starts from now. An id issued
+    by another worker or before a restart can't be resumed here, the
+    client gets a reset.
+    """
+    cursor = parse_event_id(request.headers.get("last-event-id") or last_event_id or "")
+    foreign = cursor == -1
+    if cursor is None or foreign:
+        cursor = event_log.last_id
+    
+    async def stream():
+        nonlocal cursor
+        yield "retry: 3000\n\n"
+        if foreign:
+            yield f"id: {EVENT_ID_PREFIX}{event_log.last_id}\nevent: reset\ndata: {{}}\n\n"
+        while not await request.is_disconnected():
+            events, missed = event_log.since(cursor)
+            if missed:
+                yield f"id: {EVENT_ID_PREFIX}{event_log.last_id}\nevent: reset\ndata: {{}}\n\n"
+                cursor = event_log.last_id
+                continue
+            for event_id, event_type, data in events:
+                yield f"id: {EVENT_ID_PREFIX}{event_id}\nevent: {event_type}\ndata: {data}\n\n"
+                cursor = event_id
+            if not events and not await event_log.wait(SSE_PING):
+                yield ": ping\n\n"
+    
+    return StreamingResponse(stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
 @app.post("/api/fetch")
-async def trigger_fetch(background_tasks: BackgroundTasks):
-    """Trigger news fetch"""
-    background_tasks.add_task(fetch_all_news)
-    return {"success": True, "message": "Fetching news..."}
+async def trigger_fetch(source: Optional[List[str]] = Query(None)):
+    """Trigger news fetch (all sources, or ?source=... to refresh some)"""
+    sources = RSS_SOURCES
+    if source:
+        sources = [(source_name, url) for source_name, url in RSS_SOURCES if source_name in source]
+        if len(sources) != len(set(source)):
+            return {"success": False, "error": "Unknown source"}
+    if not is_leader:
+        # another worker fetches; it picks this up on its next sync
+        job_id = uuid.uuid4().hex[:12]
+        await asyncio.to_thread(storage.request_fetch, job_id, [name for name, _ in sources] if source else [])
+        return {"success": True, "job_id": job_id, "coalesced": False, "forwarded": True,
+                "message": "Fetching news..."}
+    job = start_fetch(sources)
+    return {"success": True, "job_id": job.id, "coalesced": job.coalesced > 0,
+            "message": "Fetching news..."}
+
+@app.get("/api/fetch/summary")
+async def get_fetch_summary():
+    """Cache hits/misses per source for the last fetch"""
+    return last_fetch_summary
+
+@app.get("/api/fetch/{job_id}")
+async def get_fetch_job(job_id: str):
+    """Progress, timings and new/duplicate counts of a fetch job"""
+    job = fetch_jobs.get(job_id)
+    if job is not None:
+        return job.to_dict()
+    if SHARED_STORE:
+        # started through another worker: its state as of start and finish
+        data = await asyncio.to_thread(storage.load_job, job_id)
+        if data is not None:
+            return data
+    return {"success": False, "error": "Not found"}
+
+@app.get("/api/schedule")
+async def get_schedule():
+    """Learned poll interval, next run and circuit state per source"""
+    return scheduler.snapshot(RSS_SOURCES)
+
+MAX_BULK = 500
+
+class ArticleQuery(BaseModel):
+    """Select articles by query instead of ids: the top_k most relevant matches"""
+    top_k: int = Field(10, ge=1, le=MAX_BULK)
+    status: Optional[str] = None
+    source: Optional[str] = None
+    min_relevance: Optional[float] = None
+    since: Optional[str] = None
+
+class BulkRequest(BaseModel):
+    ids: Optional[List[int]] = Field(None, max_length=MAX_BULK)
+    query: Optional[ArticleQuery] = None
+
+def bulk_targets(request: BulkRequest, default_status: str) -> List[int]:
+    """Article ids for a bulk call, from the id list or the query. Exactly
+    one must be given: an empty body must not act on the default query."""
+    if (request.ids is None) == (request.query is None):
+        raise ValueError("Give exactly one of ids or query")
+    if request.ids is not None:
+        return list(dict.fromkeys(request.ids))
+    query = request.query
+    items, _ = query_articles(None, query.top_k, query.status or default_status, query.source,
+                              query.min_relevance, parse_since(query.since))
+    return [article["id"] for article in items]
+
+async def bulk_review(request: BulkRequest, status: str) -> Dict:
+    """Set status on every target in one step (no await until persist)"""
+    try:
+        ids = bulk_targets(request, default_status="fetched")
+    except ValueError as e:
+        return bad_request(str(e))
+    results = []
+    for article_id in ids:
+        article = articles_db.get(article_id)
+        if article is None:
+            results.append({"id": article_id, "success": False, "error": "Not found"})
+        elif article["status"] == "posted":
+            results.append({"id": article_id, "success": False, "error": "Already posted"})
+        else:
+            articles_db.update(article_id, status=status)
+            results.append({"id": article_id, "success": True, "status": status})
+    await persist()
+    return {"success": True, "updated": sum(r["success"] for r in results), "results": results}
+
+@app.post("/api/articles/bulk/approve")
+async def bulk_approve(request: BulkRequest):
+    """Approve many articles: {"ids": [...]} or {"query": {"top_k": 5, ...}}"""
+    return await bulk_review(request, "approved")
+
+@app.post("/api/articles/bulk/reject")
+async def bulk_reject(request: BulkRequest):
+    """Reject many articles, same body as bulk approve"""
+    return await bulk_review(request, "rejected")
+
+@app.post("/api/articles/bulk/generate")
+async def bulk_generate(request: BulkRequest):
+    """Generate posts for many articles (query defaults to approved ones)"""
+    try:
+        ids = bulk_targets(request, default_status="approved")
+    except ValueError as e:
+        return bad_request(str(e))
+    results = []
+    for article_id in ids:
+        error = enqueue_generation(article_id)
+        results.append({"id": article_id, "success": error is None} if error is None
+                       else {"id": article_id, "success": False, "error": error})
+    # posts arrive as post-added events once generated
+    return {"success": True, "queued": sum(r["success"] for r in results), "results": results}
 
 @app.post("/api/articles/{article_id}/approve")
 async def approve_article(article_id: int):
     """Approve an article"""
-    for article in articles_db:
-        if article["id"] == article_id:
-            article["status"] = "approved"
-            return {"success": True}
-    return {"success": False, "error": "Not found"}
+    if articles_db.update(article_id, status="approved") is None:
+        return {"success": False, "error": "Not found"}
+    await persist()
+    return {"success": True}
 
 @app.post("/api/articles/{article_id}/generate")
 async def generate_article_posts(article_id: int):
-    """Generate posts for an article"""
-    for article in articles_db:
-        if article["id"] == article_id:
-            new_posts = generate_posts(article)
-            posts_db.extend(new_posts)
-            article["status"] = "posted"
-            return new_posts
-    return {"success": False, "error": "Not found"}
+    """Queue post generation for an article; posts arrive as post-added events"""
+    error = enqueue_generation(article_id)
+    if error is not None:
+        return {"success": False, "error": error}
+    return {"success": True, "queued": True}
 
 @app.post("/api/posts/{post_id}/posted")
 async def mark_post_posted(post_id: int):
-    """Mark a post as posted"""
-    for post in posts_db:
-        if post["id"] == post_id:
-            post["status"] = "posted"
-            return {"success": True}
-    return {"success": False, "error": "Not found"}
+    """Mark a post as posted (by hand)"""
+    if posts_db.update(post_id, status="posted") is None:
+        return {"success": False, "error": "Not found"}
+    await persist()
+    return {"success": True}
+
+@app.post("/api/posts/{post_id}/retry")
+async def retry_post(post_id: int):
+    """Send a failed post again"""
+    post = posts_db.get(post_id)
+    if post is None:
+        return {"success": False, "error": "Not found"}
+    if post["status"] != "failed" or post["platform"] not in publishers:
+        return {"success": False, "error": "Only failed posts of a published platform can be retried"}
+    posts_db.update(post_id, status="queued", attempts=0, next_attempt_at=0)
+    await persist()
+    publisher_wakeup.set()
+    return {"success": True}
+
+@app.get("/api/publishing")
+async def get_publishing():
+    """Generation backlog and per-platform publisher state"""
+    platforms = {}
+    for platform in POST_TEMPLATES:
+        publisher = publishers.get(platform)
+        platforms[platform] = {
+            "publisher": type(publisher).__name__ if publisher else None,
+            "rate_per_minute": publish_rates[platform],
+            "char_limit": POST_TEMPLATES[platform].limit,
+            "tokens": publish_buckets[platform].available() if publisher else None,
+            "by_status": {status: len(ids & posts_db.ids_where("platform", platform))
+                          for status, ids in posts_db.indexes["status"].items() if ids},
+        }
+    return {"generation_pending": len(generation_pending), "publishing": publisher_task is not None
+            and not publisher_task.done(), "platforms": platforms}
 
 @app.get("/api/health")
 async def health():
@@ -527,8 +3986,35 @@ async def health():
 # ============== STARTUP ==============
 @app.on_event("startup")
 async def startup():
+    global storage, worker_task
     print("=" * 50)
     print("🇸🇸 JUNUB TIMES - Starting up...")
     print("=" * 50)
-    # Fetch news on startup
-    asyncio.create_task(fetch_all_news())
+    storage = open_storage()
+    if SHARED_STORE:
+        join_workers()
+    load_state()
+    print(f"💾 Loaded {len(articles_db)} articles, {len(posts_db)} posts from {STORAGE_BACKEND}")
+    # Refresh in the background, the dashboard already has the last state.
+    # With shared workers only the lease holder fetches.
+    if SHARED_STORE:
+        worker_task = asyncio.create_task(worker_loop())
+    else:
+        start_fetcher()
+        start_publisher()
+
+@app.on_event("shutdown")
+async def shutdown():
+    if worker_task is not None:
+        worker_task.cancel()
+    for task in (scheduler_task, publisher_task, generation_task):
+        if task is not None:
+            task.cancel()
+    await persist()
+    if SHARED_STORE and is_leader:
+        storage.release_lease("fetch")
+    storage.close()
+    if http_client is not None:
+        await http_client.aclose()
+    if parse_executor is not None:
+        parse_executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,29 @@
+"""python -m bench {micro,cycle,api_load,compare,feed_server,all} [options]
+
+`all` runs micro, cycle and api_load with their defaults, each in its
+own process so module state doesn't leak between them.
+"""
+import subprocess
+import sys
+
+from bench.common import ROOT
+
+COMMANDS = ("micro", "cycle", "api_load", "compare", "feed_server")
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] not in COMMANDS + ("all",):
+        print(__doc__)
+        return 2
+    command, argv = sys.argv[1], sys.argv[2:]
+    if command == "all":
+        for name in ("micro", "cycle", "api_load"):
+            code = subprocess.run([sys.executable, "-m", f"bench.{name}"], cwd=ROOT).returncode
+            if code:
+                return code
+        return 0
+    module = __import__(f"bench.{command}", fromlist=["main"])
+    result = module.main(argv)
+    return result if command == "compare" else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
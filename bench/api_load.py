@@ -0,0 +1,131 @@
+"""Load test of GET /api/articles with 1k / 10k / 100k stored articles.
+
+Fills the in-memory store with synthetic articles, then drives the app
+in-process (httpx ASGI transport, so no sockets or server in the numbers)
+with concurrent clients over a mix of queries: first page, deep cursor
+pages, status / source / min_relevance / since filters. The ETag body
+cache is off unless --response-cache is given, so the numbers are the
+query and serialization cost rather than cache hits.
+
+    python -m bench.api_load --sizes 1000,10000,100000 --requests 500
+"""
+import argparse
+import asyncio
+import os
+import random
+import time
+from typing import Dict, List, Optional
+
+from bench.common import percentiles, save_results, setup_env
+
+STATUS_MIX = (("fetched", 0.8), ("approved", 0.1), ("rejected", 0.05), ("posted", 0.05))
+
+def fill_store(m, size: int, seed: int = 1):
+    """Replace the article store contents with `size` synthetic articles"""
+    from bench.feed_server import feed_options, synthetic_item
+    rng = random.Random(seed)
+    options = feed_options()
+    names = [name for name, _ in m.RSS_SOURCES]
+    statuses = [status for status, _ in STATUS_MIX]
+    weights = [weight for _, weight in STATUS_MIX]
+    now = int(time.time())
+    articles = []
+    for number in range(1, size + 1):
+        item = synthetic_item(number, number % len(names), options)
+        articles.append(m.Article(
+            id=number,
+            title=item["title"],
+            url=f"{item['link']}?n={number}",
+            summary=item["summary"][:500],
+            source=names[number % len(names)],
+            relevance=round(rng.uniform(0.1, 1.0), 2),
+            status=rng.choices(statuses, weights)[0],
+            fetched_at=now - (size - number) * 72 * 3600 // size,  # spread over 72h, oldest first
+        ))
+    for article in list(m.articles_db):
+        m.articles_db.remove(article["id"])
+    m.articles_db.take_removed()
+    m.articles_db.load(articles)
+    m.articles_db.take_dirty()
+
+async def deep_cursor(client, pages: int) -> Optional[str]:
+    cursor = None
+    for _ in range(pages):
+        params = {"limit": 50}
+        if cursor:
+            params["cursor"] = cursor
+        cursor = (await client.get("/api/articles", params=params)).json()["next_cursor"]
+        if cursor is None:
+            break
+    return cursor
+
+async def load_test(m, size: int, args: argparse.Namespace) -> Dict:
+    import httpx
+    started = time.perf_counter()
+    fill_store(m, size)
+    fill_seconds = time.perf_counter() - started
+    transport = httpx.ASGITransport(app=m.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        since = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(time.time() - 3600))
+        queries = {
+            "first_page": {"limit": 50},
+            "page_10": {"limit": 50, "cursor": await deep_cursor(client, 10)},
+            "status_approved": {"limit": 50, "status": "approved"},
+            "source": {"limit": 50, "source": m.RSS_SOURCES[0][0]},
+            "min_relevance_0.9": {"limit": 50, "min_relevance": 0.9},
+            "since_1h": {"limit": 50, "since": since},
+            "rare_filter": {"limit": 50, "status": "posted", "source": m.RSS_SOURCES[1][0],
+                            "min_relevance": 0.95},
+        }
+        results = {}
+        for name, params in queries.items():
+            params = {key: value for key, value in params.items() if value is not None}
+            for _ in range(args.warmup):
+                await client.get("/api/articles", params=params)
+            latencies: List[float] = []
+            remaining = args.requests
+
+            async def worker():
+                nonlocal remaining
+                while remaining > 0:
+                    remaining -= 1
+                    request_started = time.perf_counter()
+                    response = await client.get("/api/articles", params=params)
+                    latencies.append(time.perf_counter() - request_started)
+                    response.raise_for_status()
+
+            run_started = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+            elapsed = time.perf_counter() - run_started
+            results[name] = {"requests_per_sec": round(len(latencies) / elapsed, 1),
+                             "latency_ms": percentiles(latencies)}
+            print(f"  {size:>7} {name:<18} {results[name]['requests_per_sec']:>8} req/s  "
+                  f"p50 {results[name]['latency_ms']['p50']} ms  p99 {results[name]['latency_ms']['p99']} ms")
+    return {"fill_seconds": round(fill_seconds, 3), "process_rss": m.process_rss(), "queries": results}
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000,100000", help="comma separated store sizes")
+    parser.add_argument("--requests", type=int, default=500, help="requests per query and size")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--response-cache", action="store_true",
+                        help="keep the rendered-body cache on (repeated queries become cache hits)")
+    parser.add_argument("--output", help="result file (default bench/results/api_load-<time>.json)")
+    args = parser.parse_args(argv)
+    setup_env()
+    os.environ["RETENTION_MAX_ARTICLES"] = str(10 ** 9)
+    import backend.main as m
+    if not args.response_cache:
+        m.RESPONSE_CACHE_ENTRIES = 0
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    print(f"⏱  /api/articles load test at {sizes} articles")
+    results = {str(size): asyncio.run(load_test(m, size, args)) for size in sizes}
+    params = {"sizes": sizes, "requests": args.requests, "concurrency": args.concurrency,
+              "warmup": args.warmup, "response_cache": args.response_cache}
+    save_results("api_load", params, results, args.output)
+    return results
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Shared benchmark helpers: environment, timing, percentiles, result files"""
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def setup_env():
+    """Call before importing backend.main: in-memory store, no scheduler,
+    and no proxy in the way of the local feed server"""
+    os.environ.setdefault("STORAGE_BACKEND", "memory")
+    os.environ.setdefault("SCHEDULER_ENABLED", "0")
+    for name in ("HTTP_PROXY", "HTTPS_PROXY", "ALL_PROXY", "http_proxy", "https_proxy", "all_proxy"):
+        os.environ.pop(name, None)
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+
+def percentiles(samples: List[float], scale: float = 1000.0) -> Dict[str, float]:
+    """p50/p90/p95/p99/max/mean of samples (seconds), in ms by default"""
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def at(fraction: float) -> float:
+        return round(ordered[min(int(fraction * len(ordered)), len(ordered) - 1)] * scale, 3)
+
+    return {
+        "count": len(ordered),
+        "mean": round(sum(ordered) / len(ordered) * scale, 3),
+        "p50": at(0.50),
+        "p90": at(0.90),
+        "p95": at(0.95),
+        "p99": at(0.99),
+        "max": round(ordered[-1] * scale, 3),
+    }
+
+def measure(fn: Callable, repeat: int = 5, min_time: float = 0.2) -> Dict[str, float]:
+    """Time fn() like timeit: calibrate a loop count that runs >= min_time,
+    then report the best and median per-call time over `repeat` loops"""
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        if time.perf_counter() - started >= min_time:
+            break
+        number *= 2
+    runs = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        runs.append((time.perf_counter() - started) / number)
+    runs.sort()
+    return {
+        "loops": number,
+        "best_us": round(runs[0] * 1e6, 3),
+        "median_us": round(runs[len(runs) // 2] * 1e6, 3),
+    }
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def save_results(name: str, params: Dict, results: Dict, output: Optional[str] = None) -> str:
+    """Write a result file (bench/results/<name>-<timestamp>.json by default)"""
+    document = {
+        "benchmark": name,
+        "created_at": datetime.utcnow().isoformat(),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "params": params,
+        "results": results,
+    }
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"{name}-{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}.json")
+    with open(output, "w") as f:
+        json.dump(document, f, indent=2)
+    print(f"💾 Results saved to {output}")
+    return output
@@ -0,0 +1,79 @@
+"""Compare two result files of the same benchmark.
+
+    python -m bench.compare bench/results/micro-A.json bench/results/micro-B.json [--threshold 10]
+
+Lists every numeric result that moved and exits 1 if any got worse by
+more than --threshold percent. Throughput-like values (per_sec) are
+better higher; times (us, ms, seconds, latency percentiles) better lower.
+"""
+import argparse
+import json
+import sys
+from typing import Dict, Iterator, List, Optional, Tuple
+
+HIGHER_IS_BETTER = ("per_sec",)
+LOWER_IS_BETTER = ("_us", "seconds", "latency_ms", "p50", "p90", "p95", "p99", "mean", "max")
+IGNORED = ("loops", "count", "cycle", "articles_total", "process_rss")
+
+def leaves(value, path: Tuple[str, ...] = ()) -> Iterator[Tuple[Tuple[str, ...], float]]:
+    if isinstance(value, dict):
+        for key, child in value.items():
+            yield from leaves(child, path + (str(key),))
+    elif isinstance(value, list):
+        for index, child in enumerate(value):
+            yield from leaves(child, path + (str(index),))
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        yield path, float(value)
+
+def direction(path: Tuple[str, ...]) -> int:
+    """+1 if higher is better, -1 if lower is better, 0 if not comparable"""
+    if path[-1] in IGNORED:
+        return 0
+    joined = ".".join(path)
+    if any(marker in joined for marker in HIGHER_IS_BETTER):
+        return 1
+    if any(marker in joined for marker in LOWER_IS_BETTER):
+        return -1
+    return 0
+
+def compare(old: Dict, new: Dict, threshold: float) -> List[Dict]:
+    before = dict(leaves(old["results"]))
+    rows = []
+    for path, value in leaves(new["results"]):
+        sign = direction(path)
+        if sign == 0 or path not in before or before[path] == 0:
+            continue
+        change = (value - before[path]) / before[path] * 100
+        rows.append({
+            "metric": ".".join(path),
+            "old": before[path],
+            "new": value,
+            "change_pct": round(change, 1),
+            "regression": change * sign < -threshold,
+        })
+    return rows
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("old")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=10, help="percent change counted as a regression")
+    args = parser.parse_args(argv)
+    with open(args.old) as f:
+        old = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+    if old["benchmark"] != new["benchmark"]:
+        print(f"Different benchmarks: {old['benchmark']} vs {new['benchmark']}")
+        return 2
+    print(f"{old['benchmark']}: {old.get('git_commit')} -> {new.get('git_commit')}")
+    rows = compare(old, new, args.threshold)
+    for row in rows:
+        flag = "❌" if row["regression"] else "  "
+        print(f"{flag} {row['metric']:<60} {row['old']:>12g} -> {row['new']:>12g}  {row['change_pct']:+.1f}%")
+    regressions = sum(row["regression"] for row in rows)
+    print(f"{regressions} regression(s) over {args.threshold}%")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""End-to-end fetch cycle throughput against the local feed server.
+
+Starts bench.feed_server in a subprocess, points every RSS_SOURCES entry
+at it and runs fetch_all_news() a few times: the first cycle is cold
+(everything parsed), later ones exercise 304s and unchanged bodies.
+
+    python -m bench.cycle --cycles 5 --latency 0.3 --error-rate 0.05
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+from bench.common import ROOT, percentiles, save_results, setup_env
+from bench.feed_server import add_feed_options, feed_arguments, local_sources
+
+async def wait_ready(url: str, timeout: float = 20):
+    import httpx
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(url)).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Feed server not ready at {url}")
+
+async def run_cycles(args: argparse.Namespace) -> Dict:
+    import backend.main as m
+    sources = local_sources(m.RSS_SOURCES, args.port, args.single_host)[:args.sources]
+    await wait_ready(sources[0][1].rsplit("/feed/", 1)[0] + "/health")
+    cycles = []
+    for number in range(1, args.cycles + 1):
+        job = m.FetchJob(sources)
+        started = time.perf_counter()
+        await m.fetch_all_news(sources, job)
+        elapsed = time.perf_counter() - started
+        progress = job.progress.values()
+        fetched = sum(p.get("fetched", 0) for p in progress)
+        cycle = {
+            "cycle": number,
+            "seconds": round(elapsed, 3),
+            "sources_per_sec": round(len(sources) / elapsed, 2),
+            "entries_per_sec": round(fetched / elapsed, 1),
+            "entries_kept": fetched,
+            "articles_added": sum(p.get("new", 0) for p in progress),
+            "articles_total": len(m.articles_db),
+            "results": m.last_fetch_summary["totals"],
+            "skipped_open_circuit": sum(1 for p in progress if p["state"] == "skipped"),
+            "source_latency_ms": percentiles([p["elapsed"] for p in progress if "elapsed" in p]),
+        }
+        cycles.append(cycle)
+        print(f"  cycle {number}: {cycle['seconds']}s, {cycle['sources_per_sec']} sources/s, "
+              f"{cycle['articles_added']} new, {cycle['results']}")
+        if number < args.cycles and args.pause:
+            await asyncio.sleep(args.pause)
+    await m.get_http_client().aclose()
+    if m.parse_executor is not None:
+        m.parse_executor.shutdown()
+    warm = cycles[1:]
+    return {
+        "cold": cycles[0],
+        "warm_mean_seconds": round(sum(c["seconds"] for c in warm) / len(warm), 3) if warm else None,
+        "cycles": cycles,
+    }
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_feed_options(parser)
+    parser.add_argument("--cycles", type=int, default=3)
+    parser.add_argument("--pause", type=float, default=0, help="seconds between cycles")
+    parser.add_argument("--sources", type=int, default=None, help="only the first N sources")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--single-host", action="store_true",
+                        help="serve every feed from 127.0.0.1 (per-host limits then apply to all)")
+    parser.add_argument("--fetch-timeout", type=float, default=10)
+    parser.add_argument("--fetch-mode", choices=("concurrent", "sequential"), default="concurrent")
+    parser.add_argument("--parse-executor", choices=("thread", "process", "inline"), default="thread")
+    parser.add_argument("--output", help="result file (default bench/results/cycle-<time>.json)")
+    args = parser.parse_args(argv)
+    os.environ["FETCH_TIMEOUT"] = str(args.fetch_timeout)
+    os.environ["FETCH_MODE"] = args.fetch_mode
+    os.environ["PARSE_EXECUTOR"] = args.parse_executor
+    setup_env()
+
+    server = subprocess.Popen(
+        [sys.executable, "-m", "bench.feed_server", "--port", str(args.port)] + feed_arguments(args),
+        cwd=ROOT,
+    )
+    try:
+        print(f"⏱  {args.cycles} fetch cycles against the local feed server")
+        results = asyncio.run(run_cycles(args))
+    finally:
+        server.terminate()
+        server.wait()
+    params = {key: value for key, value in vars(args).items() if key != "output"}
+    save_results("cycle", params, results, args.output)
+    return results
+
+if __name__ == "__main__":
+    main()
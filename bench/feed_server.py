@@ -0,0 +1,270 @@
+"""Local stand-in for every feed in RSS_SOURCES.
+
+Serves recorded fixtures (bench/fixtures/<slug>.xml, see --record) or
+synthetic RSS 2.0 / RDF feeds, with injected latency, size and errors:
+
+    python -m bench.feed_server --port 8900 --latency 0.2 --error-rate 0.05
+
+Each original host gets its own loopback address (127.0.0.2, .3, ...),
+so the fetcher's per-host limits and connection pools behave as they do
+against the real hosts. That needs the whole 127/8 block routed to
+loopback (Linux default); use --single-host elsewhere.
+"""
+import argparse
+import asyncio
+import hashlib
+import html
+import os
+import random
+import re
+import sys
+import time
+from email.utils import formatdate
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from bench.common import setup_env
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Words that hit the relevance keywords, and ones that don't
+SUBJECTS = ["South Sudan", "Juba", "Salva Kiir", "Riek Machar", "UNMISS", "Jonglei", "Upper Nile",
+            "Abyei", "Malakal", "Bor", "Sudan", "Khartoum", "Darfur", "IGAD", "Nile"]
+OTHER_SUBJECTS = ["Paris", "Tokyo", "Chicago", "Sydney", "Berlin", "Toronto", "Lima", "Oslo"]
+VERBS = ["announces", "rejects", "debates", "reports", "delays", "approves", "warns of", "plans"]
+NOUNS = ["budget", "talks", "election", "floods", "oil exports", "peace deal", "refugee camp",
+         "market prices", "road project", "court ruling", "school fees", "health workers",
+         "football league", "cattle raids", "aid convoy", "curfew"]
+PUBLISHERS = ["Reuters", "AP News", "BBC", "Al Jazeera", "VOA", "Radio Tamazuj", "Sudans Post",
+              "Eye Radio", "The East African", "Africanews"]
+
+def slug(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+
+def local_sources(sources: List[Tuple[str, str]], port: int,
+                  single_host: bool = False) -> List[Tuple[str, str]]:
+    """RSS_SOURCES pointed at the feed server, one loopback address per real host"""
+    addresses: Dict[str, str] = {}
+    local = []
+    for index, (name, url) in enumerate(sources):
+        host = urlsplit(url).hostname or ""
+        if host not in addresses:
+            addresses[host] = "127.0.0.1" if single_host else f"127.0.0.{len(addresses) + 2}"
+        local.append((name, f"http://{addresses[host]}:{port}/feed/{index}"))
+    return local
+
+def synthetic_item(number: int, source_index: int, options: argparse.Namespace) -> Dict:
+    """Item `number` of a source. Shared items are the same wire story in
+    every feed (different link and publisher suffix), like Google News."""
+    shared = random.Random(number).random() < options.shared_ratio
+    rng = random.Random(number if shared else (source_index << 32) | number)
+    relevant = rng.random() < options.relevant_ratio
+    subject = rng.choice(SUBJECTS if relevant else OTHER_SUBJECTS)
+    story = f"{subject} {rng.choice(VERBS)} {rng.choice(NOUNS)} {rng.choice(NOUNS)} {number}"
+    publisher = random.Random((source_index << 32) | number).choice(PUBLISHERS)
+    sentences = []
+    while sum(len(s) for s in sentences) < options.summary_bytes:
+        sentences.append(f"{rng.choice(SUBJECTS if relevant else OTHER_SUBJECTS)} officials "
+                         f"{rng.choice(VERBS)} the {rng.choice(NOUNS)} on {rng.choice(NOUNS)}.")
+    return {
+        "title": f"{story} - {publisher}",
+        "link": f"https://example.com/{source_index}/{number}",
+        "summary": f"<p>{' '.join(sentences)}</p>",
+        "published": options.epoch + number * options.spacing,
+    }
+
+def render_feed(name: str, source_index: int, version: int, options: argparse.Namespace) -> bytes:
+    """Feed body at a version: `items` entries, newest first, advancing by
+    a `churn` share of the feed per version"""
+    shift = max(1, round(options.items * options.churn))
+    newest = options.base_items + version * shift
+    items = [synthetic_item(n, source_index, options) for n in range(newest, newest - options.items, -1)]
+    rdf = options.format == "rdf" or (options.format == "mixed" and source_index % 3 == 2)
+    esc = html.escape
+    if rdf:
+        body = "".join(
+            f'<item rdf:about="{esc(i["link"])}"><title>{esc(i["title"])}</title>'
+            f'<link>{esc(i["link"])}</link><description>{esc(i["summary"])}</description>'
+            f'<dc:date>{time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(i["published"]))}</dc:date></item>'
+            for i in items
+        )
+        return (
+            '<?xml version="1.0" encoding="utf-8"?>'
+            '<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" '
+            'xmlns="http://purl.org/rss/1.0/" xmlns:dc="http://purl.org/dc/elements/1.1/">'
+            f'<channel rdf:about="https://example.com/{source_index}"><title>{esc(name)}</title>'
+            f'<link>https://example.com/{source_index}</link><description>synthetic</description></channel>'
+            f'{body}</rdf:RDF>'
+        ).encode()
+    body = "".join(
+        f'<item><title>{esc(i["title"])}</title><link>{esc(i["link"])}</link>'
+        f'<description>{esc(i["summary"])}</description>'
+        f'<pubDate>{formatdate(i["published"], usegmt=True)}</pubDate></item>'
+        for i in items
+    )
+    return (
+        '<?xml version="1.0" encoding="utf-8"?><rss version="2.0"><channel>'
+        f'<title>{esc(name)}</title><link>https://example.com/{source_index}</link>'
+        f'<description>synthetic</description>{body}</channel></rss>'
+    ).encode()
+
+class FeedServer:
+    """Raw ASGI app: GET /feed/{index}, with ETag/304 and injected faults"""
+
+    def __init__(self, sources: List[Tuple[str, str]], options: argparse.Namespace):
+        self.sources = sources
+        self.options = options
+        self.rng = random.Random(options.seed)
+        self.versions = [0] * len(sources)
+        self.bodies: Dict[Tuple[int, int], bytes] = {}
+        self.fixtures: Dict[int, bytes] = {}
+        for index, (name, _) in enumerate(sources):
+            path = os.path.join(FIXTURES_DIR, f"{slug(name)}.xml")
+            if not options.synthetic_only and os.path.exists(path):
+                with open(path, "rb") as f:
+                    self.fixtures[index] = f.read()
+        self.requests = 0
+
+    def body(self, index: int) -> bytes:
+        if index in self.fixtures:
+            return self.fixtures[index]
+        key = (index, self.versions[index])
+        if key not in self.bodies:
+            self.bodies.pop((index, self.versions[index] - 1), None)
+            self.bodies[key] = render_feed(self.sources[index][0], index, self.versions[index], self.options)
+        return self.bodies[key]
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                await send({"type": message["type"] + ".complete"})
+                if message["type"] == "lifespan.shutdown":
+                    return
+        match = re.fullmatch(r"/feed/(\d+)", scope["path"])
+        if scope["path"] == "/health":
+            return await self.respond(send, 200, b"ok")
+        if not match or int(match.group(1)) >= len(self.sources):
+            return await self.respond(send, 404, b"not found")
+        index = int(match.group(1))
+        self.requests += 1
+        options, rng = self.options, self.rng
+
+        latency = options.latency * (1 + options.jitter * (2 * rng.random() - 1))
+        if rng.random() < options.slow_rate:
+            latency = options.slow_latency
+        if rng.random() < options.timeout_rate:
+            latency = options.hang
+        await asyncio.sleep(max(latency, 0))
+        if rng.random() < options.error_rate:
+            return await self.respond(send, 503, b"injected error")
+
+        if index not in self.fixtures and rng.random() < options.churn_rate:
+            self.versions[index] += 1
+        body = self.body(index)
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()[:16]
+        headers = dict(scope["headers"])
+        if not options.no_etag and headers.get(b"if-none-match", b"").decode() == etag:
+            return await self.respond(send, 304, b"", etag)
+        if rng.random() < options.malformed_rate:
+            body = body[:len(body) // 2]
+        await self.respond(send, 200, body, None if options.no_etag else etag)
+
+    async def respond(self, send, status: int, body: bytes, etag: Optional[str] = None):
+        headers = [(b"content-type", b"application/rss+xml; charset=utf-8"),
+                   (b"content-length", str(len(body)).encode())]
+        if etag:
+            headers.append((b"etag", etag.encode()))
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_feed_options(parser)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--record", action="store_true",
+                        help="download every real feed into bench/fixtures/ and exit")
+    return parser
+
+def add_feed_options(parser: argparse.ArgumentParser):
+    """Options shared with bench.cycle, which passes them through"""
+    group = parser.add_argument_group("feeds")
+    group.add_argument("--items", type=int, default=20, help="entries per feed")
+    group.add_argument("--summary-bytes", type=int, default=400, help="approximate summary size")
+    group.add_argument("--relevant-ratio", type=float, default=0.6, help="share of on-topic entries")
+    group.add_argument("--shared-ratio", type=float, default=0.3,
+                       help="share of entries that are the same story in every feed")
+    group.add_argument("--format", choices=("rss", "rdf", "mixed"), default="mixed")
+    group.add_argument("--churn", type=float, default=0.2, help="share of a feed replaced per new version")
+    group.add_argument("--churn-rate", type=float, default=0.5, help="chance a request sees a new version")
+    group.add_argument("--spacing", type=float, default=600, help="seconds between entry publish times")
+    group.add_argument("--latency", type=float, default=0.05, help="mean response delay (s)")
+    group.add_argument("--jitter", type=float, default=0.5, help="+/- share of latency")
+    group.add_argument("--slow-rate", type=float, default=0.0)
+    group.add_argument("--slow-latency", type=float, default=5.0)
+    group.add_argument("--timeout-rate", type=float, default=0.0, help="requests that hang for --hang s")
+    group.add_argument("--hang", type=float, default=60.0)
+    group.add_argument("--error-rate", type=float, default=0.0, help="requests answered with 503")
+    group.add_argument("--malformed-rate", type=float, default=0.0, help="bodies cut off half way")
+    group.add_argument("--no-etag", action="store_true", help="never answer 304")
+    group.add_argument("--synthetic-only", action="store_true", help="ignore recorded fixtures")
+    group.add_argument("--seed", type=int, default=1)
+
+def finish_options(options: argparse.Namespace) -> argparse.Namespace:
+    options.base_items = options.items
+    options.epoch = time.time() - 2 * options.items * options.spacing
+    return options
+
+def feed_options(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Feed options with their defaults, for generating items outside the server"""
+    parser = argparse.ArgumentParser()
+    add_feed_options(parser)
+    return finish_options(parser.parse_args(argv or []))
+
+def feed_arguments(options: argparse.Namespace) -> List[str]:
+    """Re-serialize the feed options for a feed server subprocess"""
+    parser = argparse.ArgumentParser()
+    add_feed_options(parser)
+    arguments = []
+    for action in parser._actions:
+        if not action.option_strings or action.dest == "help":
+            continue
+        value = getattr(options, action.dest)
+        if isinstance(value, bool):
+            if value:
+                arguments.append(action.option_strings[0])
+        else:
+            arguments += [action.option_strings[0], str(value)]
+    return arguments
+
+def record(sources: List[Tuple[str, str]]):
+    import httpx
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+    with httpx.Client(timeout=30, follow_redirects=True) as client:
+        for name, url in sources:
+            try:
+                response = client.get(url)
+                response.raise_for_status()
+            except httpx.HTTPError as e:
+                print(f"Error recording {name}: {e}")
+                continue
+            with open(os.path.join(FIXTURES_DIR, f"{slug(name)}.xml"), "wb") as f:
+                f.write(response.content)
+            print(f"📥 {name}: {len(response.content)} bytes")
+
+def main(argv: Optional[List[str]] = None):
+    options = build_parser().parse_args(argv)
+    setup_env()
+    from backend.main import RSS_SOURCES
+    if options.record:
+        return record(RSS_SOURCES)
+    finish_options(options)
+    import uvicorn
+    app = FeedServer(RSS_SOURCES, options)
+    print(f"📡 Serving {len(RSS_SOURCES)} feeds on {options.host}:{options.port} "
+          f"({len(app.fixtures)} recorded)", file=sys.stderr)
+    uvicorn.run(app, host=options.host, port=options.port, log_level="warning", access_log=False)
+
+if __name__ == "__main__":
+    main()
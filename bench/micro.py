@@ -0,0 +1,67 @@
+"""Microbenchmarks for the per-entry hot paths: relevance scoring, feed
+parsing (streaming and the feedparser fallback) and post generation.
+
+    python -m bench.micro [--entries 1000] [--output results.json]
+"""
+import argparse
+from typing import List, Optional
+
+from bench.common import measure, save_results, setup_env
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=1000, help="synthetic entries to score")
+    parser.add_argument("--feed-items", type=int, default=20, help="entries per parsed feed")
+    parser.add_argument("--output", help="result file (default bench/results/micro-<time>.json)")
+    args = parser.parse_args(argv)
+    setup_env()
+    import backend.main as m
+    from bench.feed_server import feed_options, render_feed, synthetic_item
+
+    options = feed_options(["--items", str(args.feed_items)])
+    items = [synthetic_item(n, n % 50, options) for n in range(args.entries)]
+    pairs = [(item["title"], item["summary"]) for item in items]
+    title, summary = pairs[0]
+    rss = render_feed("bench", 0, 0, options)
+    rdf = render_feed("bench", 2, 0, feed_options(["--items", str(args.feed_items), "--format", "rdf"]))
+    article = m.Article(id=1, title=title, url=items[0]["link"], summary=summary, source="bench",
+                        relevance=0.8, status="approved", fetched_at=0)
+
+    def stream_parse(body: bytes, chunk: int = 16384):
+        stream = m.FeedStream()
+        for start in range(0, len(body), chunk):
+            if stream.feed(body[start:start + chunk]):
+                break
+        else:
+            stream.close()
+        return stream.result("bench")
+
+    def relevance_loop():
+        for title, summary in pairs:
+            m.calculate_relevance(title, summary)
+
+    print(f"⏱  Microbenchmarks over {len(pairs)} entries")
+    results = {
+        "relevance_single": measure(lambda: m.calculate_relevance(title, summary)),
+        "relevance_loop": measure(relevance_loop, repeat=3),
+        "relevance_batch": measure(lambda: m.calculate_relevance_batch(pairs), repeat=3),
+        "tokenize": measure(lambda: m.tokenize(f"{title} {summary}")),
+        "strip_html": measure(lambda: m.strip_html(summary)),
+        "parse_rss_feed": measure(lambda: m.parse_entries(rss, "bench"), repeat=3),
+        "parse_rdf_feed": measure(lambda: m.parse_entries(rdf, "bench"), repeat=3),
+        "stream_rss_feed": measure(lambda: stream_parse(rss), repeat=3),
+        "stream_rdf_feed": measure(lambda: stream_parse(rdf), repeat=3),
+        "generate_posts": measure(lambda: m.generate_posts(article)),
+        "near_dup_signature": measure(lambda: m.near_duplicates.signature(title, summary)),
+    }
+    for name in ("relevance_loop", "relevance_batch"):
+        results[name]["per_entry_us"] = round(results[name]["best_us"] / len(pairs), 3)
+    for name, timing in results.items():
+        print(f"  {name:<20} {timing['best_us']:>12.1f} µs")
+    params = {"entries": len(pairs), "feed_items": args.feed_items,
+              "feed_bytes": {"rss": len(rss), "rdf": len(rdf)}}
+    save_results("micro", params, results, args.output)
+    return results
+
+if __name__ == "__main__":
+    main()